@@ -1,3 +1,5 @@
+import dataclasses
+import os
 import signal
 import sys
 
@@ -23,6 +25,7 @@ from vs_mgr.commands import (
     check_dependencies,
     cmd_info,
     cmd_check_version,
+    cmd_train_dict,
     perform_update,
 )
 from vs_mgr.cli import setup_argument_parser
@@ -70,6 +73,9 @@ def main():
     # Setup full logging with directory from settings
     console_mgr.setup_logging(log_dir=settings.log_dir)
 
+    # Apply command-line overrides before components read their settings
+    settings = apply_cli_overrides(args, settings)
+
     # Initialize interfaces and components
     components = initialize_components(console_mgr, settings, dry_run)
 
@@ -84,14 +90,53 @@ def main():
     return process_command(args, components, settings)
 
 
+def apply_cli_overrides(args, settings):
+    """Return settings with command line overrides applied"""
+    overrides = {}
+    if args.no_cache:
+        overrides["api_cache_ttl"] = 0
+    if args.command == "update":
+        if args.max_backups is not None:
+            overrides["max_backups"] = args.max_backups
+        if args.level is not None:
+            overrides["zstd_level"] = args.level
+        if args.max_compression:
+            overrides["zstd_level"] = 19
+        if args.show_size:
+            overrides["backup_show_size"] = True
+    if not overrides:
+        return settings
+    return dataclasses.replace(settings, **overrides)
+
+
+def load_zstd_dict(console_mgr, settings):
+    """Read the configured zstd dictionary, or return None if unset or unreadable"""
+    if not settings.zstd_dict_path:
+        return None
+    try:
+        with open(settings.zstd_dict_path, "rb") as f:
+            return f.read()
+    except OSError as e:
+        console_mgr.warning(
+            f"Could not read zstd dictionary '{settings.zstd_dict_path}', compressing without it: {e}"
+        )
+        return None
+
+
 def initialize_components(console_mgr, settings, dry_run):
     """Initialize all system components and interfaces"""
     # Core interfaces
     process_runner = SubprocessProcessRunner()
     http_client = RequestsHttpClient()
     filesystem = OsFileSystem(process_runner=process_runner)
-    archiver = TarfileArchiver()
-    compressor = ZstdCompressor()
+    archiver = TarfileArchiver(write_buffer=settings.archive_write_buffer)
+    compressor = ZstdCompressor(
+        compression_level=settings.zstd_level,
+        threads=settings.zstd_threads,
+        dict_data=load_zstd_dict(console_mgr, settings),
+        max_window_log=settings.zstd_max_window_log,
+        long_window_log=settings.zstd_long_window,
+    )
 
     # System interface
     system = SystemInterface(
@@ -122,6 +167,7 @@ def initialize_components(console_mgr, settings, dry_run):
         compressor=compressor,
         console=console_mgr,
         settings=settings,
+        process_runner=process_runner,
     )
 
     update_mgr = UpdateManager(
@@ -167,10 +213,6 @@ def process_command(args, components, settings):
 
     try:
         if args.command == "update":
-            # Update max_backups if specified
-            if args.max_backups is not None:
-                settings.max_backups = args.max_backups
-
             result = perform_update(
                 components["update_mgr"],
                 args.version,
@@ -194,6 +236,20 @@ def process_command(args, components, settings):
                 console, components["version_checker"], args.channel
             )
 
+        elif args.command == "train-dict":
+            result = cmd_train_dict(
+                console,
+                settings,
+                components["system"],
+                components["filesystem"],
+                args.samples_dir or settings.data_dir,
+                args.output
+                or settings.zstd_dict_path
+                or os.path.join(settings.backup_dir, "vs_data.dict"),
+                args.dict_size,
+                args.max_samples,
+            )
+
         else:
             console.error(f"Unknown command: {args.command}")
             setup_argument_parser().print_help()
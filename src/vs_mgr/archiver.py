@@ -1,9 +1,21 @@
 import tarfile
 import os
+import queue
+import re
+import stat
+import functools
+import threading
 from pathlib import Path
-from typing import Union, List
+from typing import Union, List, BinaryIO, Dict, Optional, Callable, Tuple, Iterator
 import fnmatch
 
+try:
+    import pwd
+    import grp
+except ImportError:  # Not available on non-POSIX platforms
+    pwd = None
+    grp = None
+
 from vs_mgr.interfaces import IArchiver
 
 
@@ -13,9 +25,274 @@ class SecurityError(Exception):
     pass
 
 
+@functools.lru_cache(maxsize=32)
+def _compile_excludes(patterns: Tuple[str, ...]) -> Callable[[str], bool]:
+    """Compile exclude patterns into a single predicate over relative paths.
+
+    Literal paths are checked with one frozenset lookup and glob patterns with
+    one combined regex, instead of an fnmatch call per pattern per entry.
+
+    Args:
+        patterns: Glob patterns relative to the archive root (trailing "/" optional)
+
+    Returns:
+        A function returning True if a relative path is excluded
+    """
+    patterns = tuple(pattern.rstrip("/") for pattern in patterns)
+    literals = frozenset(p for p in patterns if not re.search(r"[*?[]", p))
+    globs = [p for p in patterns if p not in literals]
+    if not globs:
+        return literals.__contains__
+
+    glob_match = re.compile("|".join(fnmatch.translate(p) for p in globs)).match
+
+    def is_excluded(rel_path: str) -> bool:
+        return rel_path in literals or glob_match(rel_path) is not None
+
+    return is_excluded
+
+
+def _fadvise(fd: int, advice_name: str) -> None:
+    """Best-effort posix_fadvise over a whole file; a no-op where unsupported."""
+    advice = getattr(os, advice_name, None)
+    if advice is None or not hasattr(os, "posix_fadvise"):
+        return
+    try:
+        os.posix_fadvise(fd, 0, 0, advice)
+    except OSError:
+        pass
+
+
+def _prefetch(items: Iterator, maxsize: int) -> Iterator:
+    """Run an iterator in a background thread, buffering up to maxsize items.
+
+    Lets a producer (e.g. a directory walk) run ahead of a slower consumer.
+    Items arrive in the original order; an exception raised by the producer
+    is re-raised in the consumer. Abandoning the returned iterator stops the
+    producer.
+    """
+    buffer: queue.Queue = queue.Queue(maxsize=maxsize)
+    stopped = threading.Event()
+    done = object()
+
+    def put(item) -> bool:
+        while not stopped.is_set():
+            try:
+                buffer.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def produce() -> None:
+        try:
+            for item in items:
+                if not put((item, None)):
+                    return
+            put((done, None))
+        except BaseException as e:
+            put((done, e))
+
+    producer = threading.Thread(target=produce, name="archive-walk", daemon=True)
+    producer.start()
+    try:
+        while True:
+            item, error = buffer.get()
+            if item is done:
+                if error is not None:
+                    raise error
+                return
+            yield item
+    finally:
+        stopped.set()
+        producer.join()
+
+
 class TarfileArchiver(IArchiver):
     """Implementation of IArchiver using tarfile."""
 
+    def __init__(self, write_buffer: int = 4 * 1024 * 1024, prefetch: int = 256):
+        """Initialize TarfileArchiver.
+
+        Args:
+            write_buffer: Size in bytes of the chunks member data is copied and
+                streamed output is written in (tarfile defaults to 10-16 KiB)
+            prefetch: Number of directory entries a background thread may list
+                and stat ahead of the thread writing the archive (0 = walk inline)
+        """
+        self.write_buffer = write_buffer
+        self.prefetch = prefetch
+
+    @staticmethod
+    def _tarinfo_from_stat(
+        tar: tarfile.TarFile,
+        path: str,
+        arcname: str,
+        st: os.stat_result,
+        names: Dict[tuple, str],
+    ) -> Optional[tarfile.TarInfo]:
+        """Build a TarInfo from an existing lstat result.
+
+        Mirrors TarFile.gettarinfo for regular files, directories and symlinks
+        without stat'ing the path again, and caches user/group name lookups.
+
+        Args:
+            tar: The archive being written (used for hard link tracking)
+            path: Filesystem path of the entry
+            arcname: Name of the entry inside the archive
+            st: Result of os.lstat(path)
+            names: Cache of ("u"|"g", id) -> name lookups, shared across calls
+
+        Returns:
+            The TarInfo, or None for entry types that need TarFile.gettarinfo
+        """
+        mode = st.st_mode
+        info = tarfile.TarInfo(arcname)
+        if stat.S_ISREG(mode):
+            inode = (st.st_ino, st.st_dev)
+            if st.st_nlink > 1 and inode in tar.inodes:
+                # Already archived under another name: store a hard link
+                info.type = tarfile.LNKTYPE
+                info.linkname = tar.inodes[inode]
+            else:
+                if st.st_nlink > 1:
+                    tar.inodes[inode] = arcname
+                info.type = tarfile.REGTYPE
+                info.size = st.st_size
+        elif stat.S_ISDIR(mode):
+            info.type = tarfile.DIRTYPE
+        elif stat.S_ISLNK(mode):
+            info.type = tarfile.SYMTYPE
+            info.linkname = os.readlink(path)
+        else:
+            return None
+
+        info.mode = stat.S_IMODE(mode)
+        info.uid = st.st_uid
+        info.gid = st.st_gid
+        info.mtime = st.st_mtime
+        if pwd:
+            key = ("u", st.st_uid)
+            if key not in names:
+                try:
+                    names[key] = pwd.getpwuid(st.st_uid)[0]
+                except KeyError:
+                    names[key] = ""
+            info.uname = names[key]
+        if grp:
+            key = ("g", st.st_gid)
+            if key not in names:
+                try:
+                    names[key] = grp.getgrgid(st.st_gid)[0]
+                except KeyError:
+                    names[key] = ""
+            info.gname = names[key]
+        return info
+
+    def _add_entry(
+        self,
+        tar: tarfile.TarFile,
+        path: str,
+        arcname: str,
+        names: Dict[tuple, str],
+        st: Optional[os.stat_result] = None,
+    ) -> None:
+        """Add a single (non-recursive) entry to the archive with one lstat and open.
+
+        An already available lstat result (e.g. from DirEntry.stat) can be
+        passed as st to skip the stat call.
+        """
+        if st is None:
+            st = os.lstat(path)
+        info = self._tarinfo_from_stat(tar, path, arcname, st, names)
+        if info is None:
+            # FIFOs, devices, sockets: let tarfile handle (or skip) them
+            tar.add(path, arcname=arcname, recursive=False)
+        elif info.isreg():
+            with open(path, "rb") as f:
+                # Each file is read once front to back: ask for aggressive
+                # readahead, then drop it from the page cache so archiving does
+                # not evict the running server's working set
+                _fadvise(f.fileno(), "POSIX_FADV_SEQUENTIAL")
+                tar.addfile(info, f)
+                _fadvise(f.fileno(), "POSIX_FADV_DONTNEED")
+        else:
+            tar.addfile(info)
+
+    def _add_tree(
+        self,
+        tar: tarfile.TarFile,
+        top_dir: str,
+        arc_prefix: str,
+        rel_prefix: str,
+        is_excluded: Callable[[str], bool],
+        names: Dict[tuple, str],
+    ) -> None:
+        """Add everything below top_dir to the archive, top-down.
+
+        The directory listing (_walk_tree) runs in a background thread up to
+        `prefetch` entries ahead, so reading directories overlaps with reading
+        files into the archive.
+
+        Args:
+            tar: The archive being written
+            top_dir: Directory whose contents are added (not the entry itself)
+            arc_prefix: Archive name prefix for top_dir's children (ends with a separator)
+            rel_prefix: Exclude-pattern path prefix for top_dir's children
+                ("" for the archive source directory, otherwise ends with a separator)
+            is_excluded: Predicate from _compile_excludes
+            names: Shared uname/gname lookup cache
+        """
+        entries = self._walk_tree(top_dir, arc_prefix, rel_prefix, is_excluded)
+        if self.prefetch > 0:
+            entries = _prefetch(entries, self.prefetch)
+        for entry, arcname in entries:
+            # Stat'ed here, just before the entry is read, not when listed
+            self._add_entry(
+                tar, entry.path, arcname, names, entry.stat(follow_symlinks=False)
+            )
+
+    @staticmethod
+    def _walk_tree(
+        top_dir: str,
+        arc_prefix: str,
+        rel_prefix: str,
+        is_excluded: Callable[[str], bool],
+    ) -> Iterator[Tuple[os.DirEntry, str]]:
+        """Yield (DirEntry, arcname) for everything below top_dir, top-down.
+
+        Walks with os.scandir, so entry types come from the listing and the
+        DirEntry caches the one stat the archiver makes. Excluded directories
+        are not descended into and symlinked directories are not followed.
+        Like os.walk, directories that cannot be listed are skipped.
+        """
+        sep = os.sep
+        # (directory path, archive name prefix, relative path prefix)
+        pending = [(top_dir, arc_prefix, rel_prefix)]
+        while pending:
+            dir_path, arc_prefix, rel_prefix = pending.pop()
+            try:
+                # Materialize the listing so the directory fd is closed before
+                # descending; sorted for a reproducible member order
+                with os.scandir(dir_path) as it:
+                    entries = sorted(it, key=lambda entry: entry.name)
+            except OSError as e:
+                print(f"Warning: skipping unreadable directory {dir_path}: {e}")
+                continue
+
+            subdirs = []
+            for entry in entries:
+                name = entry.name
+                rel_path = rel_prefix + name
+                if is_excluded(rel_path):
+                    continue
+                arcname = arc_prefix + name
+                yield entry, arcname
+                if entry.is_dir(follow_symlinks=False):
+                    subdirs.append((entry.path, arcname + sep, rel_path + sep))
+            # Reversed so the stack pops subdirectories in name order
+            pending.extend(reversed(subdirs))
+
     def extractall(
         self, archive_path: Union[str, Path], dest_path: Union[str, Path]
     ) -> bool:
@@ -32,68 +309,78 @@ class TarfileArchiver(IArchiver):
             # Ensure destination directory exists
             os.makedirs(dest_path, exist_ok=True)
 
-            with tarfile.open(archive_path) as tar:
-                # Create a safer extraction function to avoid path traversal attacks
-                def is_within_directory(directory, target):
-                    abs_directory = os.path.abspath(directory)
-                    abs_target = os.path.abspath(target)
-                    prefix = os.path.commonprefix([abs_directory, abs_target])
-                    return prefix == abs_directory
-
-                def safe_extract(tar, path):
-                    for member in tar.getmembers():
-                        member_path = os.path.join(path, member.name)
-                        if not is_within_directory(path, member_path):
-                            raise SecurityError("Attempted path traversal in tar file")
-                    tar.extractall(path)
-
-                safe_extract(tar, str(dest_path))
+            # Stream mode decompresses the archive once, front to back; checking
+            # every member up front and then extracting read it twice. The
+            # "data" filter rejects path traversal, absolute paths, links out of
+            # dest_path and device files as each member is extracted.
+            with tarfile.open(archive_path, "r|*") as tar:
+                tar.extractall(str(dest_path), filter="data")
             return True
-        except (tarfile.TarError, OSError, SecurityError) as e:
+        except tarfile.FilterError as e:
+            print(
+                f"Error extracting archive {archive_path}: unsafe member rejected: {e}"
+            )
+            return False
+        except (tarfile.TarError, OSError) as e:
             print(f"Error extracting archive {archive_path}: {e}")
             return False
 
     def create(
         self,
         source_dir: Union[str, Path],
-        archive_path: Union[str, Path],
+        archive_path: Union[str, Path, BinaryIO],
         exclude_patterns: List[str] = [],
     ) -> bool:
         """Create an archive.
 
         Args:
             source_dir: Directory to archive
-            archive_path: Path to save the archive to
-            exclude_patterns: Patterns to exclude
+            archive_path: Path to save the archive to, or a writable binary
+                file-like object the archive is streamed into (no seeking)
+            exclude_patterns: Glob patterns matched against paths relative to
+                source_dir (e.g. "Cache/" or "*.tmp"); a trailing slash is optional.
+                Excluded directories are not descended into.
 
         Returns:
             True if successful, False otherwise
         """
+        is_stream = hasattr(archive_path, "write")
         try:
-            # Ensure parent directory of archive exists
-            archive_parent = os.path.dirname(archive_path)
-            if archive_parent:
-                os.makedirs(archive_parent, exist_ok=True)
-
-            # Create archive filter function
-            def filter_func(tarinfo):
-                # Skip if file matches exclude patterns
-                if exclude_patterns:
-                    for pattern in exclude_patterns:
-                        if fnmatch.fnmatch(tarinfo.name, pattern):
-                            return None
-                return tarinfo
-
-            # Create the tarfile
-            with tarfile.open(archive_path, "w") as tar:
-                tar.add(
-                    source_dir, arcname=os.path.basename(source_dir), filter=filter_func
+            if not is_stream:
+                # Ensure parent directory of archive exists
+                archive_parent = os.path.dirname(archive_path)
+                if archive_parent:
+                    os.makedirs(archive_parent, exist_ok=True)
+
+            source_dir = os.path.normpath(source_dir)
+            arc_root = os.path.basename(source_dir)
+            is_excluded = _compile_excludes(tuple(exclude_patterns))
+
+            # Create the tarfile ("w|" writes sequentially, so streams need no seek)
+            # Large buffers mean far fewer, bigger writes into the output and
+            # reads from each member; small members are still read in one go
+            if is_stream:
+                tar_ctx = tarfile.open(
+                    fileobj=archive_path,
+                    mode="w|",
+                    bufsize=self.write_buffer,
+                    copybufsize=self.write_buffer,
                 )
+            else:
+                tar_ctx = tarfile.open(archive_path, "w", copybufsize=self.write_buffer)
+            names: Dict[tuple, str] = {}
+            sep = os.sep
+            with tar_ctx as tar:
+                self._add_entry(tar, source_dir, arc_root, names)
+                self._add_tree(tar, source_dir, arc_root + sep, "", is_excluded, names)
 
             return True
         except (tarfile.TarError, OSError) as e:
             print(f"Error creating archive {archive_path}: {e}")
-            # Clean up partial archive if it exists
-            if os.path.exists(archive_path):
-                os.remove(archive_path)
+            # Clean up partial archive if it exists (streams are owned by the caller)
+            if not is_stream:
+                try:
+                    os.remove(archive_path)
+                except FileNotFoundError:
+                    pass
             return False
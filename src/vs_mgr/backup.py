@@ -5,10 +5,20 @@ to ensure testability and flexibility.
 """
 
 import os
-import datetime
-import tempfile
-import traceback
-from typing import Optional, List, TYPE_CHECKING, Tuple
+import re
+import heapq
+import shlex
+import subprocess
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional, List, TYPE_CHECKING, Tuple, BinaryIO, TypeVar
+
+try:
+    import pwd
+    import grp
+except ImportError:  # Not available on non-POSIX platforms
+    pwd = None
+    grp = None
 
 from vs_mgr.interfaces import IFileSystem, IArchiver, ICompressor, IProcessRunner
 from vs_mgr.errors import BackupError, FileSystemError, ProcessError
@@ -18,9 +28,37 @@ if TYPE_CHECKING:
     from vs_mgr.config import ServerSettings
     from vs_mgr.system import SystemInterface  # Needed for dry_run
 
+T = TypeVar("T")
+
+# Filenames written by create_backup: vs_data_backup_<YYYYmmdd_HHMMSS>.tar.zst
+BACKUP_NAME_RE = re.compile(r"^vs_data_backup_\d{8}_\d{6}\.tar\.zst$")
+# Directories written by the hardlink strategy: vs_data_snapshot_<YYYYmmdd_HHMMSS>
+SNAPSHOT_NAME_RE = re.compile(r"^vs_data_snapshot_\d{8}_\d{6}$")
+
+# Binary size units used by _format_size, one per factor of 1024
+SIZE_UNITS = ("B", "KiB", "MiB", "GiB")
+
+# Paths inside data_dir that are never backed up (relative to data_dir)
+BACKUP_EXCLUDE_PATTERNS = ["Backups/", "BackupSave/", "Cache/", "Logs/"]
+
+# Uncompressed archive size reported by `tar --totals` (on stderr)
+TAR_TOTALS_RE = re.compile(r"Total bytes written: (\d+)")
+
+
+class _CountingWriter:
+    """Write-only stream wrapper that counts the bytes passed through it."""
+
+    def __init__(self, raw: BinaryIO):
+        self.raw = raw
+        self.bytes_written = 0
+
+    def write(self, data: bytes) -> int:
+        self.bytes_written += len(data)
+        return self.raw.write(data)
+
 
 class BackupManager:
-    """Handles backup creation (tar + zstd), rotation, and listing.
+    """Handles backup creation (tar + zstd or hardlink snapshot), rotation, and listing.
 
     Relies on injected dependencies for core operations.
 
@@ -36,7 +74,6 @@ class BackupManager:
         data_dir (str): Path to the server data directory to back up.
         max_backups (int): Maximum number of backups to keep.
         server_user (str): User/group string (e.g., "user:group") to set ownership of backups.
-        temp_dir (str): Path to the temporary directory for intermediate files.
     """
 
     def __init__(
@@ -68,6 +105,7 @@ class BackupManager:
         self.console = console
         self.settings = settings
         self.process_runner = process_runner
+        self.system = system_interface
         # Get dry_run status from SystemInterface
         self.dry_run = system_interface.dry_run
 
@@ -77,116 +115,148 @@ class BackupManager:
         self.max_backups = settings.max_backups
         # Format user/group string for chown
         self.server_user = f"{settings.server_user}:{settings.server_user}"
-        self.temp_dir = settings.temp_dir
+
+        # Filled only while create_backup runs (see _isdir_cached)
+        self._verified_dirs = set()
+        # Numeric server_user ids, resolved once so chowns need no name lookups
+        self._owner_ids = self._resolve_owner_ids()
 
         self.console.debug("BackupManager initialized.")
 
     # --- Public Methods --- #
 
     def create_backup(self, ignore_failure: bool = False) -> Optional[str]:
-        """Creates a compressed tarball backup (.tar.zst) of the server data directory.
+        """Creates a backup of the server data directory.
+
+        Depending on `backup_strategy` this is either a compressed tarball
+        (.tar.zst) or a hardlink snapshot directory (see
+        `_resolve_backup_strategy`).
 
         Steps:
         1. Perform pre-flight checks (data dir exists, backup dir exists/creatable).
         2. Calculate and log estimated data size (best effort).
         3. If not dry run:
-           a. Create a temporary tar archive excluding specified patterns.
-           b. Compress the temporary tar archive using zstandard.
-           c. Set ownership of the final backup file.
-           d. Clean up the temporary tar file.
-           e. Rotate old backups based on `max_backups` setting.
-        4. Return the path to the created backup file (or intended path in dry run).
+           a. Stream a tar archive (excluding specified patterns) straight into
+              the zstandard compressor, writing only the final backup file, or
+              rsync a snapshot hard-linking files unchanged since the last one.
+           b. Set ownership of the final backup file or snapshot directory.
+           c. Rotate old backups based on `max_backups` setting.
+        4. Return the path to the created backup (or intended path in dry run).
 
         Args:
             ignore_failure: If True, log errors but return None instead of raising BackupError.
 
         Returns:
-            The absolute path to the created backup file, or None if backup failed
-            and `ignore_failure` was True.
+            The absolute path to the created backup file or snapshot directory, or
+            None if backup failed and `ignore_failure` was True.
 
         Raises:
             BackupError: If any step fails and `ignore_failure` is False.
             FileSystemError: May be raised by underlying filesystem operations.
             ProcessError: May be raised by underlying process operations (e.g., size check).
         """
-        backup_timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
-        backup_filename = f"vs_data_backup_{backup_timestamp}.tar.zst"
-        # Ensure backup_file_path is absolute
-        backup_file_path = os.path.abspath(
-            os.path.join(self.backup_dir, backup_filename)
-        )
-        temp_tar_path = None  # Define outside try for finally block
-
-        self.console.info(f"Starting backup of '{self.data_dir}'")
-        self.console.info(f"Target backup file: {backup_file_path}")
-
-        # --- Pre-flight Checks ---
+        # Directories known to exist during this run, so repeated checks on
+        # data_dir/backup_dir don't stat them again; dropped when the run ends
+        self._verified_dirs = set()
         try:
-            self._perform_preflight_checks()
-        except (FileNotFoundError, FileSystemError, ProcessError) as e:
-            raise BackupError(f"Backup pre-flight check failed: {e}") from e
-        except Exception as e:
-            raise BackupError(
-                f"Unexpected error during backup pre-flight check: {e}"
-            ) from e
+            backup_timestamp = time.strftime("%Y%m%d_%H%M%S")
 
-        # --- Dry Run Check ---
-        if self.dry_run:
-            self.console.info(f"[DRY RUN] Would create backup: {backup_file_path}")
-            self.console.info("[DRY RUN] Skipping actual file operations and rotation.")
-            return backup_file_path  # Return intended path
+            self.console.info(f"Starting backup of '{self.data_dir}'")
 
-        # --- Backup Creation ---
-        try:
-            temp_tar_path = self._create_temporary_archive()
-            self._compress_archive(temp_tar_path, backup_file_path)
-            self._finalize_backup(backup_file_path)
-            return backup_file_path
-
-        except (FileSystemError, ProcessError, BackupError, FileNotFoundError) as e:
-            self.console.error(f"Backup process failed: {e}")
-            self.console.debug(traceback.format_exc())  # Debug level for full traceback
-            self._cleanup_failed_backup(backup_file_path)
-            if ignore_failure:
-                self.console.warning(
-                    "Continuing after backup failure (--ignore-backup-failure)"
-                )
-                return None
+            # --- Pre-flight Checks ---
+            try:
+                data_size = self._perform_preflight_checks()
+                strategy = self._resolve_backup_strategy()
+            except (FileNotFoundError, FileSystemError, ProcessError) as e:
+                raise BackupError(f"Backup pre-flight check failed: {e}") from e
+            except BackupError:
+                raise
+            except Exception as e:
+                raise BackupError(
+                    f"Unexpected error during backup pre-flight check: {e}"
+                ) from e
+
+            if strategy == "hardlink":
+                backup_filename = f"vs_data_snapshot_{backup_timestamp}"
             else:
-                # Re-raise as BackupError for consistent API
-                if not isinstance(e, BackupError):
-                    raise BackupError(
-                        f"Backup creation failed: {e}. Use --ignore-backup-failure to proceed."
-                    ) from e
+                backup_filename = f"vs_data_backup_{backup_timestamp}.tar.zst"
+            # Ensure backup_file_path is absolute
+            backup_file_path = os.path.abspath(
+                os.path.join(self.backup_dir, backup_filename)
+            )
+            self.console.info(f"Target backup: {backup_file_path}")
+            if strategy == "hardlink" and self.filesystem.exists(backup_file_path):
+                # rsync would merge into it, and failure cleanup would delete it
+                raise BackupError(f"Snapshot already exists: {backup_file_path}")
+
+            # --- Dry Run Check ---
+            if self.dry_run:
+                self.console.info(f"[DRY RUN] Would create backup: {backup_file_path}")
+                self.console.info(
+                    "[DRY RUN] Skipping actual file operations and rotation."
+                )
+                return backup_file_path  # Return intended path
+
+            # --- Backup Creation ---
+            try:
+                if strategy == "hardlink":
+                    self._run_deprioritized(
+                        self._create_hardlink_snapshot, backup_file_path
+                    )
+                    archived_size = None
                 else:
-                    raise e  # Re-raise original BackupError
-        except Exception as e:
-            self.console.error(f"Unexpected error during backup: {e}", exc_info=True)
-            self._cleanup_failed_backup(backup_file_path)
-            if ignore_failure:
-                self.console.warning(
-                    "Continuing after unexpected backup failure (--ignore-backup-failure)"
+                    archived_size = self._run_deprioritized(
+                        self._create_compressed_archive,
+                        backup_file_path,
+                        size_hint=data_size or 0,
+                    )
+                self._finalize_backup(backup_file_path, archived_size)
+                return backup_file_path
+
+            except (
+                FileSystemError,
+                ProcessError,
+                BackupError,
+                FileNotFoundError,
+            ) as e:
+                self.console.error(f"Backup process failed: {e}")
+                # Full traceback at debug level; only formatted if debug logging is on
+                self.console.debug("Backup failure traceback:", exc_info=True)
+                self._cleanup_failed_backup(backup_file_path)
+                if ignore_failure:
+                    self.console.warning(
+                        "Continuing after backup failure (--ignore-backup-failure)"
+                    )
+                    return None
+                else:
+                    # Re-raise as BackupError for consistent API
+                    if not isinstance(e, BackupError):
+                        raise BackupError(
+                            f"Backup creation failed: {e}. Use --ignore-backup-failure to proceed."
+                        ) from e
+                    else:
+                        raise e  # Re-raise original BackupError
+            except Exception as e:
+                self.console.error(
+                    f"Unexpected error during backup: {e}", exc_info=True
                 )
-                return None
-            else:
-                raise BackupError(f"Unexpected backup failure: {e}") from e
-        finally:
-            # Ensure temporary tar file is always removed if it exists
-            if temp_tar_path and self.filesystem.exists(temp_tar_path):
-                self.console.debug(f"Cleaning up temporary file: {temp_tar_path}")
-                try:
-                    self.filesystem.remove(temp_tar_path)
-                except (FileSystemError, Exception) as cleanup_e:
-                    # Log cleanup failure but don't raise, as backup might have succeeded
+                self._cleanup_failed_backup(backup_file_path)
+                if ignore_failure:
                     self.console.warning(
-                        f"Failed to clean up temp file '{temp_tar_path}': {cleanup_e}"
+                        "Continuing after unexpected backup failure (--ignore-backup-failure)"
                     )
+                    return None
+                else:
+                    raise BackupError(f"Unexpected backup failure: {e}") from e
+        finally:
+            self._verified_dirs.clear()
 
     def list_backups(self) -> List[Tuple[str, str, str]]:
         """Lists existing backups with size and modification date.
 
         Returns:
             A list of tuples: (filename, human_readable_size, modification_date_string).
+            Snapshot directories are not walked; their size reads "(snapshot)".
             Returns an empty list if the backup directory doesn't exist or on error.
         """
         self.console.info(f"Listing backups in {self.backup_dir}...")
@@ -199,12 +269,13 @@ class BackupManager:
                 # If dir doesn't exist, _get_sorted_backups logs a warning
                 return []
 
-            for backup_path, mtime in sorted_backups:
+            for backup_path, mtime, size_bytes in sorted_backups:
                 filename = os.path.basename(backup_path)
-                size_str = self._get_backup_size_human(backup_path)
-                date_str = datetime.datetime.fromtimestamp(mtime).strftime(
-                    "%Y-%m-%d %H:%M:%S"
-                )
+                if SNAPSHOT_NAME_RE.match(filename):
+                    size_str = "(snapshot)"
+                else:
+                    size_str = self._format_size(size_bytes)
+                date_str = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(mtime))
                 backup_list_details.append((filename, size_str, date_str))
 
             return backup_list_details
@@ -215,20 +286,73 @@ class BackupManager:
 
     # --- Private Helper Methods --- #
 
-    def _perform_preflight_checks(self) -> None:
-        """Runs checks before starting the backup file operations."""
-        if not self.filesystem.isdir(self.data_dir):
+    def _isdir_cached(self, path: str) -> bool:
+        """Checks that path is a directory, caching positive results for this run."""
+        if path in self._verified_dirs:
+            return True
+        is_dir = self.filesystem.isdir(path)
+        if is_dir:
+            self._verified_dirs.add(path)
+        return is_dir
+
+    def _resolve_owner_ids(self) -> Optional[Tuple[int, int]]:
+        """Looks up the numeric (uid, gid) of server_user.
+
+        Returns:
+            The ids, or None if they are unknown or the platform has no pwd/grp.
+        """
+        if pwd is None:
+            return None
+        try:
+            user, group = self.server_user.split(":")
+            return pwd.getpwnam(user).pw_uid, grp.getgrnam(group).gr_gid
+        except (KeyError, ValueError) as e:
+            self.console.warning(f"Could not resolve owner '{self.server_user}': {e}")
+            return None
+
+    def _backup_owner(self) -> Optional[Tuple[int, int]]:
+        """Gets the (uid, gid) new backup files are created with, if possible.
+
+        Ownership can only be handed to another user directly when running as
+        root; otherwise files are chowned through sudo afterwards.
+
+        Returns:
+            The numeric ids of server_user, or None if the file descriptor
+            cannot be chowned directly.
+        """
+        if not self.system.is_root:
+            return None
+        return self._owner_ids
+
+    def _chown_to_server_user(self, path: str) -> bool:
+        """Chowns a single path to server_user, by id when the ids are known."""
+        if self._owner_ids is not None:
+            return self.filesystem.chown_ids(path, *self._owner_ids)
+        user, group = self.server_user.split(":")
+        return self.filesystem.chown(path, user, group, recursive=False)
+
+    def _perform_preflight_checks(self) -> Optional[int]:
+        """Runs checks before starting the backup file operations.
+
+        Returns:
+            The estimated data directory size in bytes, or None if unknown or
+            not calculated (the `backup_show_size` setting is off).
+        """
+        if not self._isdir_cached(self.data_dir):
             raise FileNotFoundError(f"Data directory not found: {self.data_dir}")
 
-        self._log_data_size()  # Log estimated size
+        # Walking the whole data directory only for a size estimate is costly
+        # on large worlds; the archived size is reported afterwards anyway
+        data_size = None
+        if self.settings.backup_show_size:
+            data_size = self._log_data_size()  # Log estimated size
 
         # Ensure backup directory exists and has correct owner if possible
         self.console.debug(f"Ensuring backup directory exists: {self.backup_dir}")
         try:
             self.filesystem.mkdir(self.backup_dir, exist_ok=True)
-            # Split user/group for chown call if using IFileSystem
-            user, group = self.server_user.split(":")
-            if not self.filesystem.chown(self.backup_dir, user, group, recursive=False):
+            self._verified_dirs.add(self.backup_dir)
+            if not self._chown_to_server_user(self.backup_dir):
                 self.console.warning(
                     f"IFileSystem.chown reported failure for backup directory '{self.backup_dir}'"
                 )
@@ -242,59 +366,285 @@ class BackupManager:
                 f"Unexpected error ensuring backup directory '{self.backup_dir}': {err}"
             )
 
-    def _create_temporary_archive(self) -> str:
-        """Creates the temporary tar archive."""
-        # Create temporary tar file securely
-        self.console.info("Creating temporary tar archive...")
-        if not self.filesystem.isdir(self.temp_dir):
-            self.console.debug(f"Creating temporary directory: {self.temp_dir}")
-            self.filesystem.mkdir(self.temp_dir, exist_ok=True)
+        return data_size
+
+    def _resolve_backup_strategy(self) -> str:
+        """Decides between a compressed archive and a hardlink snapshot.
+
+        "auto" picks snapshots only when data_dir and backup_dir are on the same
+        filesystem (hard links cannot cross devices) and rsync is available;
+        otherwise it falls back to "tar_zst".
+
+        Returns:
+            "hardlink" or "tar_zst".
 
-        with tempfile.NamedTemporaryFile(
-            delete=False, suffix=".tar", dir=self.temp_dir
-        ) as temp_tar_file:
-            temp_tar_path = os.path.abspath(temp_tar_file.name)
-        self.console.debug(f"Temporary tar file path: {temp_tar_path}")
+        Raises:
+            BackupError: If "hardlink" was requested but cannot be used.
+        """
+        strategy = self.settings.backup_strategy
+        if strategy == "tar_zst":
+            return strategy
+
+        can_run_rsync = self.system.rsync_available and self.process_runner
+        if strategy == "hardlink":
+            if not can_run_rsync:
+                raise BackupError(
+                    "backup_strategy 'hardlink' requires rsync and a process runner."
+                )
+            return strategy
 
+        if not can_run_rsync or getattr(os, "link", None) is None:
+            return "tar_zst"
+        try:
+            same_device = (
+                os.stat(self.data_dir).st_dev == os.stat(self.backup_dir).st_dev
+            )
+        except OSError as e:
+            self.console.debug(f"Could not compare backup/data filesystems: {e}")
+            return "tar_zst"
+        if not same_device:
+            return "tar_zst"
+        self.console.debug(
+            "Data and backup directories share a filesystem; using hardlink snapshots."
+        )
+        return "hardlink"
+
+    def _run_deprioritized(self, func: Callable[..., T], *args, **kwargs) -> T:
+        """Runs func with the configured backup CPU and I/O priority.
+
+        The priority is lowered on a dedicated thread that runs func and is
+        inherited by the threads and processes it starts (zstd workers, tar,
+        rsync). The calling thread keeps its priority, so the rest of an update
+        (download, server file sync, service restart) is not slowed down.
+
+        Returns:
+            Whatever func returns; exceptions from func propagate.
+        """
+        nice_increment = self.settings.backup_nice
+        io_priority = self.settings.backup_io_priority
+        if nice_increment <= 0 and io_priority < 0:
+            return func(*args, **kwargs)
+        with ThreadPoolExecutor(
+            max_workers=1,
+            initializer=self.system.lower_priority,
+            initargs=(nice_increment, io_priority),
+        ) as pool:
+            return pool.submit(func, *args, **kwargs).result()
+
+    def _create_hardlink_snapshot(self, snapshot_path: str) -> None:
+        """Copies the data directory into a new snapshot directory with rsync.
+
+        Files unchanged since the newest existing snapshot are hard-linked to
+        it instead of copied (`--link-dest`), so a snapshot only costs the
+        space and I/O of what changed. Each snapshot is still a complete,
+        independent copy of the data directory, restorable with a plain copy.
+
+        Args:
+            snapshot_path: Path of the new snapshot directory (must not exist).
+
+        Raises:
+            ProcessError: If rsync fails or cannot be run.
+        """
+        rsync_cmd = ["rsync", "-aH"]
+        # Anchored to the transfer root, i.e. relative to data_dir
+        rsync_cmd.extend(f"--exclude=/{pattern}" for pattern in BACKUP_EXCLUDE_PATTERNS)
+        snapshots = self.filesystem.scandir_dirs(self.backup_dir, SNAPSHOT_NAME_RE)
+        if snapshots:
+            previous, _ = max(snapshots, key=lambda item: item[1])
+            self.console.info(
+                f"Hard-linking unchanged files from '{os.path.basename(previous)}'"
+            )
+            rsync_cmd.append(f"--link-dest={previous}")
+        # Trailing slashes: copy the contents of data_dir into the snapshot
+        rsync_cmd.append(os.path.join(self.data_dir, ""))
+        rsync_cmd.append(os.path.join(snapshot_path, ""))
+
+        self.console.info(
+            f"Creating hardlink snapshot '{os.path.basename(snapshot_path)}'"
+        )
+        try:
+            self.process_runner.run(rsync_cmd, check=True, capture_output=True)
+        except subprocess.CalledProcessError as e:
+            stderr_info = (e.stderr or "").strip()
+            raise ProcessError(
+                f"rsync snapshot failed with exit code {e.returncode}: {stderr_info}"
+            ) from e
+        except OSError as e:
+            raise ProcessError(f"Could not run rsync: {e}") from e
+        self.console.info("Snapshot creation successful.")
+
+    def _create_compressed_archive(
+        self, backup_file_path: str, size_hint: int = 0
+    ) -> int:
+        """Streams the tar archive of the data directory into the compressed backup file.
+
+        The archiver writes directly into the compressor's stream, so no
+        intermediate tar file is written to (or read back from) disk.
+
+        Args:
+            backup_file_path: Path of the final .tar.zst file.
+            size_hint: Estimated uncompressed size in bytes (0 = unknown), used
+                by the compressor to choose its parameters.
+
+        Returns:
+            The uncompressed size of the tar archive in bytes.
+        """
         # Define exclusions (relative to data_dir for tar)
-        exclude_patterns = ["Backups/", "BackupSave/", "Cache/", "Logs/"]
+        exclude_patterns = BACKUP_EXCLUDE_PATTERNS
         self.console.debug(
             f"Excluding patterns relative to data_dir: {exclude_patterns}"
         )
 
-        # --- Archiving ---
-        if not self.archiver.create(
-            self.data_dir, temp_tar_path, exclude_patterns=exclude_patterns
-        ):
-            raise BackupError(
-                f"Archiver failed to create '{temp_tar_path}'. Check archiver logs/output."
+        if self._use_gnu_tar():
+            return self._create_gnu_tar_archive(
+                backup_file_path, exclude_patterns, size_hint
             )
-        self.console.info(f"Temporary archive created: {temp_tar_path}")
-        return temp_tar_path
 
-    def _compress_archive(self, temp_tar_path: str, backup_file_path: str) -> None:
-        """Compresses the temporary tar archive to the final backup file."""
         self.console.info(
-            f"Compressing '{os.path.basename(temp_tar_path)}' to '{os.path.basename(backup_file_path)}'"
+            f"Archiving and compressing to '{os.path.basename(backup_file_path)}'"
         )
-        if not self.compressor.compress(temp_tar_path, backup_file_path):
+        with self.compressor.stream_writer(
+            backup_file_path, size_hint=size_hint, owner=self._backup_owner()
+        ) as compressed_stream:
+            counter = _CountingWriter(compressed_stream)
+            archived = self.archiver.create(
+                self.data_dir, counter, exclude_patterns=exclude_patterns
+            )
+        if not archived:
             raise BackupError(
-                f"Compressor failed to compress to '{backup_file_path}'. Check compressor logs/output."
+                f"Archiver failed to write '{backup_file_path}'. Check archiver logs/output."
             )
-        self.console.info("Compression successful.")
+        self.console.info("Archive compression successful.")
+        return counter.bytes_written
 
-    def _finalize_backup(self, backup_file_path: str) -> None:
-        """Performs post-creation steps: logging size, setting ownership, rotating."""
-        backup_size_human = self._get_backup_size_human(backup_file_path)
-        self.console.info(f"Backup created: {backup_file_path} ({backup_size_human})")
+    def _use_gnu_tar(self) -> bool:
+        """Decides whether tar_zst backups are written by GNU tar and zstd.
 
-        # Set ownership
+        Raises:
+            BackupError: If archive_backend is 'gnu_tar' but the commands or a
+                process runner are not available.
+        """
+        backend = self.settings.archive_backend
+        if backend == "python":
+            return False
+        available = bool(
+            self.process_runner
+            and self.system.which("tar")
+            and self.system.which("zstd")
+        )
+        if backend == "gnu_tar":
+            if not available:
+                raise BackupError(
+                    "archive_backend 'gnu_tar' requires the tar and zstd commands "
+                    "and a process runner."
+                )
+            return True
+        # The dictionary may have failed to load, which only tarfile handles
+        return available and not self.settings.zstd_dict_path
+
+    def _create_gnu_tar_archive(
+        self, backup_file_path: str, exclude_patterns: List[str], size_hint: int = 0
+    ) -> int:
+        """Writes the .tar.zst backup with GNU tar, compressing through zstd.
+
+        The archive has the same member names as the in-process archiver
+        (rooted at the data directory's name) and zstd gets the same settings,
+        but the per-file work runs in native code.
+
+        Args:
+            backup_file_path: Path of the final .tar.zst file.
+            exclude_patterns: Patterns to exclude, relative to data_dir.
+            size_hint: Estimated uncompressed size in bytes (0 = unknown).
+
+        Returns:
+            The uncompressed size of the tar archive in bytes (0 if tar did
+            not report it).
+
+        Raises:
+            ProcessError: If tar or zstd fails or cannot be run.
+        """
+        parent_dir, arc_root = os.path.split(os.path.normpath(self.data_dir))
+        zstd_cmd = self.compressor.command_line(
+            size_hint, dict_path=self.settings.zstd_dict_path
+        )
+        tar_cmd = [
+            "tar",
+            "--create",
+            "--force-local",  # A ':' in the path does not mean a remote host
+            f"--file={backup_file_path}",
+            f"--use-compress-program={shlex.join(zstd_cmd)}",
+            "--totals",
+            # Patterns match whole member names, i.e. relative to data_dir
+            "--anchored",
+        ]
+        tar_cmd.extend(
+            f"--exclude={arc_root}/{pattern.rstrip('/')}"
+            for pattern in exclude_patterns
+        )
+        tar_cmd.extend([f"--directory={parent_dir or '.'}", "--", arc_root])
+
+        owner = self._backup_owner()
+        if owner is not None:
+            # tar truncates the file rather than replacing it, keeping the owner
+            with open(backup_file_path, "wb") as output_file:
+                os.fchown(output_file.fileno(), *owner)
+
+        self.console.info(
+            f"Archiving and compressing to '{os.path.basename(backup_file_path)}' "
+            "with tar and zstd"
+        )
+        try:
+            result = self.process_runner.run(tar_cmd, check=False, capture_output=True)
+        except OSError as e:
+            raise ProcessError(f"Could not run tar: {e}") from e
+        stderr = (result.stderr or "").strip()
+        if result.returncode == 1:
+            # Files changed while being read, as is expected of a running server
+            self.console.warning(f"tar reported changes during the backup: {stderr}")
+        elif result.returncode != 0:
+            raise ProcessError(
+                f"tar backup failed with exit code {result.returncode}: {stderr}"
+            )
+        self.console.info("Archive compression successful.")
+
+        match = TAR_TOTALS_RE.search(stderr)
+        return int(match.group(1)) if match else 0
+
+    def _finalize_backup(
+        self, backup_file_path: str, archived_size: Optional[int]
+    ) -> None:
+        """Performs post-creation steps: logging size, setting ownership, rotating.
+
+        Args:
+            backup_file_path: Path of the new backup file or snapshot directory.
+            archived_size: Uncompressed archive size in bytes, or None for a
+                snapshot directory.
+        """
+        if archived_size is None:
+            self.console.info(f"Snapshot created: {backup_file_path}")
+        else:
+            backup_size_human = self._get_backup_size_human(backup_file_path)
+            self.console.info(
+                f"Backup created: {backup_file_path} ({backup_size_human}, "
+                f"{self._format_size(archived_size)} uncompressed)"
+            )
+
+        # Archives written as root were already chowned through their descriptor
+        if archived_size is not None and self._backup_owner() is not None:
+            self.console.debug(f"Ownership of '{backup_file_path}' already set.")
+        else:
+            self._set_backup_ownership(backup_file_path)
+
+        # Rotate backups
+        self._rotate_backups()  # Rotation handles its own errors/logging
+
+    def _set_backup_ownership(self, backup_file_path: str) -> None:
+        """Sets ownership of a new backup to server_user, logging any failure."""
         self.console.debug(
             f"Setting ownership of '{backup_file_path}' to {self.server_user}"
         )
         try:
-            user, group = self.server_user.split(":")
-            if not self.filesystem.chown(backup_file_path, user, group):
+            if not self._chown_to_server_user(backup_file_path):
                 self.console.warning(
                     f"IFileSystem reported failure setting ownership on: {backup_file_path}"
                 )
@@ -312,19 +662,20 @@ class BackupManager:
                 f"Unexpected error setting ownership on backup file '{backup_file_path}': {chown_err}"
             )
 
-        # Rotate backups
-        self._rotate_backups()  # Rotation handles its own errors/logging
-
-    def _log_data_size(self) -> None:
+    def _log_data_size(self) -> Optional[int]:
         """Logs the estimated size of the data directory using IFileSystem.
 
         Falls back to logging a warning if calculation fails.
+
+        Returns:
+            The data directory size in bytes, or None if it could not be calculated.
         """
         self.console.debug(f"Calculating size of data directory: {self.data_dir}")
         try:
             data_size = self.filesystem.calculate_dir_size(self.data_dir)
             data_size_human = self._format_size(data_size)
             self.console.info(f"Estimated data directory size: ~{data_size_human}")
+            return data_size
         except FileSystemError as e:
             self.console.warning(
                 f"Could not calculate data directory size via IFileSystem: {e}"
@@ -336,6 +687,7 @@ class BackupManager:
             )
         except Exception as e:
             self.console.warning(f"Error calculating data directory size: {e}")
+        return None
 
     def _get_backup_size_human(self, backup_file_path: str) -> str:
         """Gets the size of the final backup file in human-readable format.
@@ -362,22 +714,30 @@ class BackupManager:
             return "N/A"
 
     def _cleanup_failed_backup(self, backup_file_path: Optional[str]) -> None:
-        """Attempts to remove a potentially incomplete backup file after a failure.
+        """Attempts to remove a potentially incomplete backup after a failure.
 
         Logs errors but does not raise them.
 
         Args:
-            backup_file_path: The path to the backup file to remove, if it exists.
+            backup_file_path: The path to the backup file or snapshot directory
+                to remove, if it exists.
         """
         if not backup_file_path:  # If path wasn't even determined
             return
         try:
-            if self.filesystem.exists(backup_file_path):
+            # Remove directly instead of checking for existence first
+            if SNAPSHOT_NAME_RE.match(os.path.basename(backup_file_path)):
+                try:
+                    self.filesystem.rmtree(backup_file_path)
+                    removed = True
+                except FileNotFoundError:
+                    removed = False
+            else:
+                removed = self.filesystem.remove_if_exists(backup_file_path)
+            if removed:
                 self.console.warning(
-                    f"Attempting to clean up failed/incomplete backup: {backup_file_path}"
+                    f"Cleaned up failed/incomplete backup: {backup_file_path}"
                 )
-                self.filesystem.remove(backup_file_path)
-                self.console.info(f"Cleaned up: {backup_file_path}")
         except (FileSystemError, Exception) as e:
             self.console.error(
                 f"Failed to cleanup incomplete backup file '{backup_file_path}': {e}"
@@ -386,7 +746,9 @@ class BackupManager:
     def _rotate_backups(self) -> None:
         """Removes the oldest backups if the number exceeds `max_backups`.
 
-        Only considers files matching the pattern `vs_data_backup_*.tar.zst`.
+        Only considers files named like `vs_data_backup_<YYYYmmdd_HHMMSS>.tar.zst`
+        and snapshot directories named like `vs_data_snapshot_<YYYYmmdd_HHMMSS>`;
+        both count towards `max_backups`.
         Logs actions and any errors encountered during rotation.
         """
         if self.max_backups <= 0:
@@ -398,86 +760,113 @@ class BackupManager:
         )
 
         try:
-            backups = self._get_sorted_backups()
+            backups = self._list_backup_files()
         except (FileSystemError, Exception) as e:
             self.console.error(
                 f"Failed to list backups for rotation in '{self.backup_dir}': {e}"
             )
             return  # Cannot rotate if listing fails
 
-        backups_to_delete = backups[self.max_backups :]
+        # Select the newest max_backups without sorting the whole listing
+        keep = {
+            backup_path
+            for backup_path, _, _ in heapq.nlargest(
+                self.max_backups, backups, key=lambda item: item[1]
+            )
+        }
+        backups_to_delete = [item for item in backups if item[0] not in keep]
 
         if not backups_to_delete:
             self.console.info("No old backups need rotation.")
             return
 
         self.console.info(f"Found {len(backups_to_delete)} old backup(s) to remove.")
-        deleted_count = 0
-        for backup_path, _ in backups_to_delete:
-            if self.dry_run:
+        if self.dry_run:
+            for backup_path, _, _ in backups_to_delete:
                 self.console.info(f"[DRY RUN] Would delete old backup: {backup_path}")
-                deleted_count += 1
-                continue
-            try:
-                self.console.debug(f"Deleting old backup: {backup_path}")
-                self.filesystem.remove(backup_path)
-                deleted_count += 1
-                self.console.info(
-                    f"Deleted old backup: {os.path.basename(backup_path)}"
-                )
-            except (FileSystemError, Exception) as e:
-                # Log error for the specific file but continue trying to delete others
-                self.console.error(f"Failed to delete old backup '{backup_path}': {e}")
+            deleted_count = len(backups_to_delete)
+        else:
+            remove = self.filesystem.remove
+            rmtree = self.filesystem.rmtree
+            console = self.console
+
+            def delete(backup_path: str) -> bool:
+                try:
+                    console.debug(f"Deleting old backup: {backup_path}")
+                    if SNAPSHOT_NAME_RE.match(os.path.basename(backup_path)):
+                        rmtree(backup_path)
+                    else:
+                        remove(backup_path)
+                    console.info(f"Deleted old backup: {os.path.basename(backup_path)}")
+                    return True
+                except (FileSystemError, Exception) as e:
+                    # Log error for the specific file but continue trying to delete others
+                    console.error(f"Failed to delete old backup '{backup_path}': {e}")
+                    return False
+
+            paths = [backup_path for backup_path, _, _ in backups_to_delete]
+            workers = min(self.settings.rotation_parallel, len(paths))
+            if workers > 1:
+                # Unlinks are I/O bound; overlap them on high-latency storage
+                with ThreadPoolExecutor(max_workers=workers) as pool:
+                    deleted_count = sum(pool.map(delete, paths))
+            else:
+                deleted_count = sum(map(delete, paths))
 
         self.console.info(
             f"Backup rotation completed. {deleted_count} old backup(s) removed."
         )
 
-    def _get_sorted_backups(self) -> List[Tuple[str, float]]:
-        """Gets a list of backup files sorted by modification time (newest first).
+    def _get_sorted_backups(self) -> List[Tuple[str, float, int]]:
+        """Gets a list of backups sorted by modification time (newest first).
 
         Filters files based on the expected naming pattern.
 
         Returns:
-            A list of tuples, where each tuple contains (absolute_path, modification_time).
+            A list of (absolute_path, modification_time, size_in_bytes) tuples.
 
         Raises:
-            FileSystemError: If listing the backup directory or getting mtime fails.
+            FileSystemError: If listing the backup directory fails.
         """
-        self.console.debug(f"Listing backups in: {self.backup_dir}")
-        backup_pattern = "vs_data_backup_"
-        suffix = ".tar.zst"
-        backups = []
+        backups = self._list_backup_files()
+        # Sort by modification time, descending (newest first)
+        backups.sort(key=lambda item: item[1], reverse=True)
+        return backups
 
+    def _list_backup_files(self) -> List[Tuple[str, float, int]]:
+        """Gets the backups in the backup directory, in no particular order.
+
+        Filters names with BACKUP_NAME_RE (files) and SNAPSHOT_NAME_RE
+        (directories) and reads mtime and size from directory scans instead of
+        stat'ing each backup separately.
+
+        Returns:
+            A list of (absolute_path, modification_time, size_in_bytes) tuples.
+            Snapshot directories are not walked and report a size of 0.
+
+        Raises:
+            FileSystemError: If listing the backup directory fails.
+        """
+        self.console.debug(f"Listing backups in: {self.backup_dir}")
         try:
-            if not self.filesystem.isdir(self.backup_dir):
+            if not self._isdir_cached(self.backup_dir):
                 self.console.warning(
                     f"Backup directory '{self.backup_dir}' does not exist. Cannot list backups."
                 )
                 return []
 
-            for filename in self.filesystem.listdir(self.backup_dir):
-                if filename.startswith(backup_pattern) and filename.endswith(suffix):
-                    file_path = os.path.abspath(os.path.join(self.backup_dir, filename))
-                    try:
-                        mtime = self.filesystem.getmtime(file_path)
-                        backups.append((file_path, mtime))
-                    except (FileSystemError, NotImplementedError) as mtime_e:
-                        self.console.warning(
-                            f"Could not get modification time for '{file_path}', skipping: {mtime_e}"
-                        )
-                    except Exception as mtime_e:  # Catch broader errors
-                        self.console.warning(
-                            f"Unexpected error getting mtime for '{file_path}', skipping: {mtime_e}"
-                        )
-
-            # Sort by modification time, descending (newest first)
-            backups.sort(key=lambda item: item[1], reverse=True)
-            self.console.debug(f"Found {len(backups)} backup files matching pattern.")
+            backups = self.filesystem.scandir_files(self.backup_dir, BACKUP_NAME_RE)
+            backups.extend(
+                (path, mtime, 0)
+                for path, mtime in self.filesystem.scandir_dirs(
+                    self.backup_dir, SNAPSHOT_NAME_RE
+                )
+            )
+            self.console.debug(f"Found {len(backups)} backups matching pattern.")
             return backups
 
         except (FileSystemError, Exception) as e:
-            # If listdir itself fails
+            # If the directory scan itself fails
             self.console.error(
                 f"Error listing backup directory '{self.backup_dir}': {e}"
             )
@@ -496,11 +885,6 @@ class BackupManager:
         """
         if size_bytes < 1024:
             return f"{size_bytes} B"
-        kib = size_bytes / 1024
-        if kib < 1024:
-            return f"{kib:.1f} KiB"
-        mib = kib / 1024
-        if mib < 1024:
-            return f"{mib:.1f} MiB"
-        gib = mib / 1024
-        return f"{gib:.1f} GiB"
+        # Each unit spans 10 bits, so the bit length picks the unit directly
+        unit = min((size_bytes.bit_length() - 1) // 10, len(SIZE_UNITS) - 1)
+        return f"{size_bytes / (1 << (10 * unit)):.1f} {SIZE_UNITS[unit]}"
@@ -12,6 +12,11 @@ def setup_argument_parser():
         action="store_true",
         help="Simulate operations without making changes",
     )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Ask the version API and download server instead of using cached answers",
+    )
     parser.add_argument(
         "--generate-config",
         action="store_true",
@@ -41,6 +46,23 @@ def setup_argument_parser():
         type=int,
         help="Number of backups to keep (default: 10)",
     )
+    update_parser.add_argument(
+        "--level",
+        type=int,
+        choices=range(1, 23),
+        metavar="LEVEL",
+        help="zstd compression level for the backup, 1-22 (default: zstd_level, 3)",
+    )
+    update_parser.add_argument(
+        "--max-compression",
+        action="store_true",
+        help="Compress the backup with zstd level 19 (slow, for archival backups)",
+    )
+    update_parser.add_argument(
+        "--show-size",
+        action="store_true",
+        help="Calculate the data directory size before backing up",
+    )
 
     # 'info' command
     info_parser = subparsers.add_parser(
@@ -61,4 +83,29 @@ def setup_argument_parser():
         help="Check for versions in the specified channel (default: stable)",
     )
 
+    # 'train-dict' command
+    train_dict_parser = subparsers.add_parser(
+        "train-dict", help="Train a zstd dictionary for backup compression"
+    )
+    train_dict_parser.add_argument(
+        "--samples-dir",
+        help="Directory to sample small files from (default: data_dir)",
+    )
+    train_dict_parser.add_argument(
+        "--output",
+        help="Where to write the dictionary (default: zstd_dict_path, or vs_data.dict in backup_dir)",
+    )
+    train_dict_parser.add_argument(
+        "--dict-size",
+        type=int,
+        default=112640,
+        help="Maximum dictionary size in bytes (default: 112640)",
+    )
+    train_dict_parser.add_argument(
+        "--max-samples",
+        type=int,
+        default=10000,
+        help="Maximum number of sample files to train on (default: 10000)",
+    )
+
     return parser
@@ -1,14 +1,18 @@
+import hashlib
+import os
 import re
+import time
+import random
 import subprocess
-import requests
 
 from vs_mgr.errors import DependencyError
 from vs_mgr.ui import ConsoleManager
 from vs_mgr.system import SystemInterface
 from vs_mgr.services import ServiceManager
 from vs_mgr.versioning import VersionChecker
-from vs_mgr.backup import BackupManager
+from vs_mgr.backup import BackupManager, BACKUP_EXCLUDE_PATTERNS
 from vs_mgr.filesystem import IFileSystem
+from vs_mgr.compressor import ZstdCompressor
 
 
 def check_dependencies(system: SystemInterface, console: ConsoleManager) -> bool:
@@ -254,8 +258,8 @@ def _verify_update_url(
     """Verify the update URL is accessible"""
     update_url = f"{version_checker.downloads_base_url}/{channel}/vs_server_linux-x64_{version}.tar.gz"
     try:
-        response = requests.head(update_url, timeout=10)
-        if response.status_code == 200:
+        # Through the checker, so a URL it already verified is not asked again
+        if version_checker.verify_download_url(update_url):
             console.print(f"✓ Update file URL verified: {update_url}", style="green")
         else:
             console.print(
@@ -283,3 +287,103 @@ def perform_update(
     # Execute update
     success, _ = update_mgr.perform_update(version, skip_backup, ignore_backup_failure)
     return 0 if success else 1
+
+
+# Only small files are useful dictionary samples; larger ones are compressed
+# well by the regular match window anyway
+MAX_DICT_SAMPLE_SIZE = 256 * 1024
+
+
+def cmd_train_dict(
+    console: ConsoleManager,
+    settings,
+    system: SystemInterface,
+    filesystem: IFileSystem,
+    samples_dir: str,
+    output_path: str,
+    dict_size: int,
+    max_samples: int,
+) -> int:
+    """Train a zstd dictionary on a random subset of small files in samples_dir"""
+    if not filesystem.isdir(samples_dir):
+        console.error(f"Samples directory not found: {samples_dir}")
+        return 1
+
+    console.info(f"Collecting dictionary samples from {samples_dir}...")
+    # Caches, logs and old backups are not part of a backup, so don't train on them
+    excluded = {pattern.rstrip("/") for pattern in BACKUP_EXCLUDE_PATTERNS}
+    candidates = []
+    for dirpath, dirnames, filenames in filesystem.walk(samples_dir):
+        if dirpath == samples_dir:
+            # Prune excluded top-level directories instead of walking them
+            dirnames[:] = [name for name in dirnames if name not in excluded]
+        for filename in filenames:
+            file_path = os.path.join(dirpath, filename)
+            try:
+                size = os.lstat(file_path).st_size
+            except OSError:
+                continue
+            if 0 < size <= MAX_DICT_SAMPLE_SIZE:
+                candidates.append(file_path)
+
+    if len(candidates) > max_samples:
+        # Fixed seed over a sorted list: the same tree picks the same samples,
+        # so an unchanged world trains an unchanged dictionary
+        candidates = random.Random(0).sample(sorted(candidates), max_samples)
+
+    samples = []
+    for file_path in candidates:
+        try:
+            with open(file_path, "rb") as f:
+                samples.append(f.read())
+        except OSError as e:
+            console.debug(f"Skipping unreadable sample '{file_path}': {e}")
+
+    if not samples:
+        console.error(
+            f"No sample files up to {MAX_DICT_SAMPLE_SIZE // 1024} KiB found in {samples_dir}"
+        )
+        return 1
+
+    console.info(f"Training a {dict_size} byte dictionary on {len(samples)} samples...")
+    try:
+        dict_data = ZstdCompressor.train_dictionary(samples, dict_size)
+    except Exception as e:
+        console.error(f"Dictionary training failed: {e}")
+        return 1
+
+    if system.dry_run:
+        console.info(
+            f"[DRY RUN] Would write {len(dict_data)} byte dictionary to {output_path}"
+        )
+        return 0
+
+    try:
+        output_dir = os.path.dirname(output_path)
+        if output_dir:
+            filesystem.mkdir(output_dir, exist_ok=True)
+        if filesystem.exists(output_path):
+            new_hash = hashlib.sha256(dict_data).digest()
+            if filesystem.content_hash(output_path) == new_hash:
+                # Same samples train the same dictionary: nothing to rotate
+                console.info(f"Dictionary unchanged: {output_path}")
+                return 0
+            # Backups made with the old dictionary can only be restored with it
+            previous_path = f"{output_path}.{time.strftime('%Y%m%d_%H%M%S')}"
+            filesystem.move(output_path, previous_path)
+            console.info(f"Kept previous dictionary as {previous_path}")
+        with open(output_path, "wb") as f:
+            f.write(dict_data)
+    except OSError as e:
+        console.error(f"Could not write dictionary to '{output_path}': {e}")
+        return 1
+
+    console.print(
+        f"Dictionary written: {output_path} ({len(dict_data)} bytes)", style="green"
+    )
+    if settings.zstd_dict_path != output_path:
+        console.print(
+            f'Set zstd_dict_path = "{output_path}" in your configuration to use it for backups.',
+            style="dim",
+        )
+    return 0
@@ -1,21 +1,55 @@
 import os
+import threading
+import contextlib
 import zstandard as zstd
 from pathlib import Path
-from typing import Union
+from typing import Union, BinaryIO, Iterator, List, Optional, Tuple
 
 from vs_mgr.interfaces import ICompressor
 
+# Inputs known to be at least this large use long-distance matching
+LONG_MODE_MIN_SIZE = 1024 * 1024 * 1024
+
 
 class ZstdCompressor(ICompressor):
-    """Implementation of ICompressor using zstandard."""
+    """Implementation of ICompressor using zstandard.
+
+    Compression contexts are reused between operations (zstd resets the
+    session at the start of each frame) but never shared between threads:
+    each thread gets its own.
+    """
 
-    def __init__(self, compression_level: int = 3):
+    def __init__(
+        self,
+        compression_level: int = 3,
+        threads: int = 0,
+        dict_data: Optional[bytes] = None,
+        max_window_log: int = 0,
+        long_window_log: int = 0,
+    ):
         """Initialize ZstdCompressor with specified compression level.
 
         Args:
             compression_level: Level of compression (1-22, higher = better compression but slower)
+            threads: Number of zstd worker threads (0 = single-threaded,
+                -1 = one worker per CPU core)
+            dict_data: Optional trained zstd dictionary used for both compression
+                and decompression
+            max_window_log: Upper bound for the match window as a power of two
+                (e.g. 23 = 8 MiB; 0 = level default). The window size is what a
+                decompressor has to allocate, so this bounds restore memory.
+            long_window_log: Window for long-distance matching as a power of two
+                (0 = off). Applied instead of max_window_log to inputs known to
+                be at least LONG_MODE_MIN_SIZE bytes; inputs of unknown size
+                are treated as small, so the max_window_log cap holds.
         """
         self.compression_level = compression_level
+        self.threads = threads
+        self.dict_data = zstd.ZstdCompressionDict(dict_data) if dict_data else None
+        self.max_window_log = max_window_log
+        self.long_window_log = long_window_log
+        # Per-thread (size_hint, zstd.ZstdCompressor) of the last context built
+        self._local = threading.local()
 
     def compress(
         self, source_path: Union[str, Path], dest_path: Union[str, Path]
@@ -35,22 +69,173 @@ class ZstdCompressor(ICompressor):
             if dest_dir:
                 os.makedirs(dest_dir, exist_ok=True)
 
-            # Create a compressor with the specified compression level
-            cctx = zstd.ZstdCompressor(level=self.compression_level)
+            # Create a compressor sized for the input file
+            cctx = self._make_cctx(os.path.getsize(source_path))
 
             # Read input file and compress to output file
             with open(source_path, "rb") as input_file:
                 with open(dest_path, "wb") as output_file:
-                    cctx.copy_stream(input_file, output_file)
+                    cctx.copy_stream(
+                        input_file,
+                        output_file,
+                        read_size=zstd.COMPRESSION_RECOMMENDED_INPUT_SIZE,
+                        write_size=zstd.COMPRESSION_RECOMMENDED_OUTPUT_SIZE,
+                    )
 
             return True
         except (IOError, OSError, zstd.ZstdError) as e:
             print(f"Error compressing {source_path}: {e}")
             # Clean up partial output if it exists
-            if os.path.exists(dest_path):
+            with contextlib.suppress(FileNotFoundError):
                 os.remove(dest_path)
             return False
 
+    def _make_cctx(self, size_hint: int = 0) -> zstd.ZstdCompressor:
+        """Get a zstd compression context for the calling thread.
+
+        The context built for the previous call is reused if it was made for
+        the same size_hint, so its window buffers and loaded dictionary are not
+        allocated again.
+
+        Args:
+            size_hint: Estimated number of input bytes (0 = unknown). Used to pick
+                compression parameters (e.g. window size) suited to the input.
+        """
+        cached = getattr(self._local, "cctx", None)
+        if cached is not None and cached[0] == size_hint:
+            return cached[1]
+
+        # Not pledged as an exact size: zstd fails the frame if the input differs
+        source_size = max(size_hint, 0)
+        long_mode, window_log = self._window_settings(source_size)
+        overrides = {}
+        if long_mode:
+            # Large inputs: find repeats across the whole long window, far
+            # beyond the level's default window
+            overrides = {"window_log": window_log, "enable_ldm": True}
+        elif window_log:
+            overrides = {"window_log": window_log}
+        params = zstd.ZstdCompressionParameters.from_level(
+            self.compression_level,
+            source_size=source_size,
+            threads=self.threads,
+            **overrides,
+        )
+        cctx = zstd.ZstdCompressor(compression_params=params, dict_data=self.dict_data)
+        self._local.cctx = (size_hint, cctx)
+        return cctx
+
+    def _window_settings(self, source_size: int) -> Tuple[bool, int]:
+        """Choose long-distance matching and the window for an input size.
+
+        Args:
+            source_size: Estimated number of input bytes (0 = unknown)
+
+        Returns:
+            (long_mode, window_log); window_log is 0 to keep the level default
+        """
+        if self.long_window_log and source_size >= LONG_MODE_MIN_SIZE:
+            return True, self.long_window_log
+        if self.max_window_log:
+            default = zstd.ZstdCompressionParameters.from_level(
+                self.compression_level, source_size=source_size
+            )
+            if default.window_log > self.max_window_log:
+                return False, self.max_window_log
+        return False, 0
+
+    def command_line(
+        self, size_hint: int = 0, dict_path: Optional[str] = None
+    ) -> List[str]:
+        """Build a zstd command line compressing like this compressor.
+
+        The command filters stdin to stdout with the same level, threads and
+        window settings that stream_writer would use for size_hint.
+
+        Args:
+            size_hint: Estimated number of input bytes (0 = unknown)
+            dict_path: Optional dictionary file for zstd -D. Only the path can
+                be passed to the command, so dict_data is not used.
+
+        Returns:
+            The command and its arguments
+        """
+        source_size = max(size_hint, 0)
+        command = ["zstd", "-q", f"-{self.compression_level}"]
+        if self.compression_level > 19:
+            command.append("--ultra")
+        # -T0 = one worker per core; there is no threadless mode, -T1 is closest
+        command.append(f"-T{0 if self.threads < 0 else max(self.threads, 1)}")
+        long_mode, window_log = self._window_settings(source_size)
+        if long_mode:
+            command.append(f"--long={window_log}")
+        elif window_log:
+            command.append(f"--zstd=wlog={window_log}")
+        if source_size:
+            command.append(f"--size-hint={source_size}")
+        if dict_path:
+            command.extend(["-D", dict_path])
+        return command
+
+    @staticmethod
+    def train_dictionary(samples: List[bytes], dict_size: int = 112640) -> bytes:
+        """Train a zstd dictionary from sample file contents.
+
+        Args:
+            samples: Contents of representative files (many small samples work best)
+            dict_size: Maximum dictionary size in bytes (default 110 KiB, as `zstd --train`)
+
+        Returns:
+            The serialized dictionary, suitable for the `dict_data` argument
+
+        Raises:
+            zstd.ZstdError: If training fails (e.g. too few or too small samples)
+        """
+        return zstd.train_dictionary(dict_size, samples).as_bytes()
+
+    @contextlib.contextmanager
+    def stream_writer(
+        self,
+        dest_path: Union[str, Path],
+        size_hint: int = 0,
+        owner: Optional[Tuple[int, int]] = None,
+    ) -> Iterator[BinaryIO]:
+        """Open a writable stream that compresses into a file.
+
+        Args:
+            dest_path: Path to save the compressed file to
+            size_hint: Estimated number of bytes that will be written (0 = unknown)
+            owner: Optional (uid, gid) to give the file, set with fchown on the
+                open descriptor so the path is not resolved again
+
+        Yields:
+            A writable binary stream; data written to it is compressed into dest_path
+
+        Raises:
+            OSError, zstd.ZstdError: If the output cannot be written. A partial
+                output file is removed before the error propagates.
+        """
+        # Ensure parent directory of destination exists
+        dest_dir = os.path.dirname(dest_path)
+        if dest_dir:
+            os.makedirs(dest_dir, exist_ok=True)
+
+        cctx = self._make_cctx(size_hint)
+        try:
+            # Closing the zstd writer ends the frame and closes the output file
+            with open(dest_path, "wb") as output_file:
+                if owner is not None:
+                    os.fchown(output_file.fileno(), *owner)
+                with cctx.stream_writer(
+                    output_file, write_size=zstd.COMPRESSION_RECOMMENDED_OUTPUT_SIZE
+                ) as writer:
+                    yield writer
+        except BaseException:
+            # Clean up partial output if it exists
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(dest_path)
+            raise
+
     def decompress(
         self, source_path: Union[str, Path], dest_path: Union[str, Path]
     ) -> bool:
@@ -70,17 +255,22 @@ class ZstdCompressor(ICompressor):
                 os.makedirs(dest_dir, exist_ok=True)
 
             # Create a decompressor
-            dctx = zstd.ZstdDecompressor()
+            dctx = zstd.ZstdDecompressor(dict_data=self.dict_data)
 
             # Read compressed input file and decompress to output file
             with open(source_path, "rb") as input_file:
                 with open(dest_path, "wb") as output_file:
-                    dctx.copy_stream(input_file, output_file)
+                    dctx.copy_stream(
+                        input_file,
+                        output_file,
+                        read_size=zstd.DECOMPRESSION_RECOMMENDED_INPUT_SIZE,
+                        write_size=zstd.DECOMPRESSION_RECOMMENDED_OUTPUT_SIZE,
+                    )
 
             return True
         except (IOError, OSError, zstd.ZstdError) as e:
             print(f"Error decompressing {source_path}: {e}")
             # Clean up partial output if it exists
-            if os.path.exists(dest_path):
+            with contextlib.suppress(FileNotFoundError):
                 os.remove(dest_path)
             return False
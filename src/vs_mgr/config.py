@@ -1,35 +1,144 @@
 """Manages loading and validation of server configuration from TOML files."""
 
+import dataclasses
+import json
 import os
-
-import tomllib
-from pydantic import BaseModel, ValidationError
-from typing import TYPE_CHECKING
+import stat
+
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Dict,
+    FrozenSet,
+    Literal,
+    Optional,
+    Tuple,
+    Union,
+    get_args,
+    get_origin,
+)
 
 from vs_mgr.errors import ConfigError
+from vs_mgr.fileio import write_file_atomic, xdg_path
 
 if TYPE_CHECKING:
     from vs_mgr.ui import ConsoleManager
 
 
-# --- Constants ---
-# Get XDG config directory
-XDG_CONFIG_HOME = os.environ.get("XDG_CONFIG_HOME", os.path.expanduser("~/.config"))
-XDG_CONFIG_PATH = os.path.join(XDG_CONFIG_HOME, "vs_manage", "config.toml")
+# --- Paths ---
+# Resolved on first use rather than at import. Results are cached per
+# environment, so a changed XDG_*_HOME or HOME is seen without a reimport
+
+
+def _xdg_config_path() -> str:
+    """Path of the per-user config file, also where configs are generated."""
+    env = os.environ
+    return xdg_path(
+        env.get("XDG_CONFIG_HOME"),
+        env.get("HOME"),
+        ".config",
+        "vs_manage",
+        "config.toml",
+    )
+
+
+def _config_files() -> Tuple[str, ...]:
+    """Configuration file search paths, in the order they are tried."""
+    return ("./vs_manage.toml", _xdg_config_path(), "/etc/vs_manage.toml")
 
-# Configuration file search paths (from lowest to highest priority)
-CONFIG_FILES = [
-    "./vs_manage.toml",
-    XDG_CONFIG_PATH,
-    "/etc/vs_manage.toml",
-]
 
+# Template of the file written by ConfigManager.generate_config_file, filled
+# with str.format_map from the default settings rendered by _toml_value
+CONFIG_TEMPLATE = """# Vintage Story Server Management Script - Configuration File
+# This file was generated automatically. You can edit it to change settings.
+# Configuration files are loaded in this priority order:
+#   1. /etc/vs_manage.toml
+#   2. {config_path}
+#   3. ./vs_manage.toml
+
+# Service settings
+service_name = {service_name}
+
+# Directory settings
+server_dir = {server_dir}
+data_dir = {data_dir}
+temp_dir = {temp_dir}
+backup_dir = {backup_dir}
+log_dir = {log_dir}
+
+# User settings
+server_user = {server_user}
+
+# Backup settings
+max_backups = {max_backups}
+# "tar_zst" (compressed archives, default), "hardlink" (uncompressed rsync
+# snapshot directories sharing unchanged files) or "auto" (snapshots when
+# data_dir and backup_dir are on the same filesystem)
+backup_strategy = {backup_strategy}
+# How tar_zst backups are written: "gnu_tar" (tar piped into the zstd
+# command), "python" (built-in tarfile and zstandard) or "auto" (gnu_tar when
+# both commands are installed, unless a dictionary is set)
+archive_backend = {archive_backend}
+# Old backups deleted concurrently during rotation (1 = one at a time)
+rotation_parallel = {rotation_parallel}
+# zstd compression level (1-5 fast, 10-15 balanced, 19-22 archival)
+zstd_level = {zstd_level}
+# zstd worker threads (0 = single-threaded, -1 = one per CPU core)
+zstd_threads = {zstd_threads}
+# Largest zstd window as a power of two (23 = 8 MiB); bounds the memory
+# needed to restore a backup (0 = level default, up to 128 MiB at level 22)
+zstd_max_window_log = {zstd_max_window_log}
+# Long-distance matching window as a power of two for backups known to be
+# over 1 GiB, which needs backup_show_size (27 = 128 MiB, restorable without
+# --long; 0 = off). Takes precedence over zstd_max_window_log for those backups.
+zstd_long_window = {zstd_long_window}
+# Optional zstd dictionary created with the train-dict command.
+# Backups compressed with it can only be restored with the same file.
+# zstd_dict_path = {dict_path}
+# Archive write/copy buffer in bytes
+archive_write_buffer = {archive_write_buffer}
+# Calculate the data directory size before each backup (slow on large worlds)
+backup_show_size = {backup_show_size}
+# Backup scheduling priority: nice increment (0 = unchanged) and
+# best-effort I/O priority level 0-7 (-1 = unchanged). Update backups run
+# while the server is stopped, so only lower these to spare other services
+backup_nice = {backup_nice}
+backup_io_priority = {backup_io_priority}
+
+# Version checking settings
+downloads_base_url = {downloads_base_url}
+game_version_api_url = {game_version_api_url}
+# Seconds an API response or download URL check is reused by later runs
+# (0 = always ask the server; also available as --no-cache)
+api_cache_ttl = {api_cache_ttl}
 
-# --- Pydantic Model ---
-class ServerSettings(BaseModel):
+# Archive settings
+server_archive_format = {server_archive_format}
+extracted_dir_name = {extracted_dir_name}
+"""
+
+
+def _toml_value(value: Any) -> str:
+    """Renders a str, int or bool setting as a TOML value.
+
+    Strings become basic strings with quotes, backslashes and control
+    characters escaped, so any path can be written safely.
+    """
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, int):
+        return str(value)
+    # JSON string escapes are valid in TOML basic strings; DEL must be escaped too
+    return json.dumps(value, ensure_ascii=False).replace("\x7f", "\\u007f")
+
+
+# --- Settings ---
+@dataclasses.dataclass(slots=True, frozen=True)
+class ServerSettings:
     """Defines the structure and default values for server configuration.
 
-    Uses Pydantic for data validation.
+    Instances are immutable; use dataclasses.replace to derive changed
+    settings. Values read from TOML are checked by _settings_from_dict.
     """
 
     # Service settings
@@ -47,16 +156,120 @@ class ServerSettings(BaseModel):
 
     # Backup settings
     max_backups: int = 10
+    # "tar_zst" writes compressed archives; "hardlink" writes rsync snapshot
+    # directories that hard-link files unchanged since the previous snapshot;
+    # "auto" snapshots when data_dir and backup_dir share a filesystem. Snapshots
+    # ignore the zstd_* settings, so they are opt-in
+    backup_strategy: Literal["auto", "hardlink", "tar_zst"] = "tar_zst"
+    # How tar_zst backups are written: "gnu_tar" runs tar with the zstd command
+    # as its compressor, "python" uses tarfile and zstandard in-process, and
+    # "auto" picks gnu_tar when tar and zstd are installed and zstd_dict_path
+    # does not need the in-process path
+    archive_backend: Literal["auto", "python", "gnu_tar"] = "auto"
+    # Old backups deleted concurrently during rotation (1 = one at a time)
+    rotation_parallel: int = 8
+    # zstd compression level. Rough tiers: 1-5 favour speed (routine backups
+    # while the server is down), 10-15 are balanced, 19-22 are for archival.
+    zstd_level: int = 3
+    # zstd worker threads for backup compression (0 = single-threaded, -1 = all cores)
+    zstd_threads: int = -1
+    # Cap on the zstd window (2**N bytes) so restores need at most that much
+    # memory; 23 = 8 MiB, only lowers levels that use more (0 = no cap)
+    zstd_max_window_log: int = 23
+    # Long-distance matching window (2**N bytes) for backups known to be large
+    # (the size is only known with backup_show_size), finding repeats across
+    # chunk files far apart in the archive. 27 = 128 MiB, the most zstd
+    # decompresses without --long (0 = off)
+    zstd_long_window: int = 27
+    # Optional zstd dictionary (see the train-dict command). Backups compressed
+    # with a dictionary need the same dictionary to be restored.
+    zstd_dict_path: Optional[str] = None
+    # Bytes the archiver copies and writes per call while building a backup
+    archive_write_buffer: int = 4 * 1024 * 1024
+    # Walk the data directory before backing up to log its size and give zstd a
+    # size hint. Off by default: the walk is slow on large worlds.
+    backup_show_size: bool = False
+    # Scheduling priority of the backup work: nice increment (0 = unchanged)
+    # and Linux best-effort I/O priority level 0-7 (-1 = unchanged). Off by
+    # default: update backups run while the server is stopped.
+    backup_nice: int = 0
+    backup_io_priority: int = -1
 
     # Version checking
     downloads_base_url: str = "https://cdn.vintagestory.at/gamefiles"
     game_version_api_url: str = "https://mods.vintagestory.at/api/gameversions"
+    # Seconds the version API response and successful download URL checks are
+    # cached on disk for later runs (0 = no caching)
+    api_cache_ttl: int = 300
 
     # Archive settings
     server_archive_format: str = "vs_server_linux-x64_{version}.tar.gz"
     extracted_dir_name: str = "vintagestory"
 
 
+# Declared type of every ServerSettings field, by name
+_FIELD_TYPES: Dict[str, Any] = {
+    field.name: field.type for field in dataclasses.fields(ServerSettings)
+}
+# Names a config file may set; anything else is reported and ignored
+_VALID_KEYS: FrozenSet[str] = frozenset(_FIELD_TYPES)
+# The default settings; immutable, so every ConfigManager can share the instance
+_DEFAULT_SETTINGS = ServerSettings()
+
+
+def _matches_type(value: Any, expected: Any) -> bool:
+    """Checks a TOML value against a (simple) field annotation.
+
+    Supports the plain types, Optional/Union and Literal used by ServerSettings.
+    bool is not accepted where an int is expected.
+    """
+    origin = get_origin(expected)
+    if origin is Literal:
+        return value in get_args(expected)
+    if origin is Union:
+        return any(_matches_type(value, arg) for arg in get_args(expected))
+    if expected is type(None):
+        return value is None
+    if expected is int:
+        return isinstance(value, int) and not isinstance(value, bool)
+    return isinstance(value, expected)
+
+
+def _settings_from_dict(config_data: Dict[str, Any]) -> ServerSettings:
+    """Builds ServerSettings from parsed TOML, checking each value's type.
+
+    Keys that are not settings are ignored.
+
+    Raises:
+        ValueError: Listing every value that does not match its field's type.
+    """
+    values = {}
+    errors = []
+    for key, value in config_data.items():
+        if key not in _VALID_KEYS:
+            continue
+        expected = _FIELD_TYPES[key]
+        if not _matches_type(value, expected):
+            expected_name = (
+                expected.__name__
+                if isinstance(expected, type)
+                else repr(expected).replace("typing.", "")
+            )
+            errors.append(f"{key}: expected {expected_name}, got {value!r}")
+            continue
+        values[key] = value
+    if errors:
+        raise ValueError("; ".join(errors))
+    return ServerSettings(**values)
+
+
+def _is_comments_only(data: bytes) -> bool:
+    """Checks whether TOML source contains nothing but comments and blank lines."""
+    return all(
+        line.lstrip().startswith(b"#") for line in data.splitlines() if line.strip()
+    )
+
+
 # --- Configuration Management ---
 class ConfigManager:
     """Handles loading configuration from files and generating a default config.
@@ -66,14 +279,23 @@ class ConfigManager:
         console (ConsoleManager): Instance for logging and user output.
     """
 
+    # Parsed settings per config file, keyed by absolute path and validated
+    # against the file's (mtime_ns, size) so edits are picked up
+    _parse_cache: Dict[str, Tuple[Tuple[int, int], ServerSettings]] = {}
+
     def __init__(self, console: "ConsoleManager"):
         """Initializes the ConfigManager.
 
         Args:
             console: An instance of ConsoleManager for logging.
         """
-        self.settings = ServerSettings()  # Start with Pydantic defaults
+        self.settings = _DEFAULT_SETTINGS  # Start with the defaults
         self.console = console
+        # Search path in which this manager found no config file at all, so
+        # later loads skip probing it again; a changed XDG_CONFIG_HOME, HOME or
+        # working directory gives a different search path and is probed.
+        # Cleared by reload(force=True)
+        self._empty_search_path: Optional[Tuple[str, ...]] = None
         # Logging is handled via the passed ConsoleManager instance
 
     def load_config(self) -> ServerSettings:
@@ -88,26 +310,70 @@ class ConfigManager:
             ConfigError: If a config file is found but is invalid (parsing error,
                          validation error) or if there's an unexpected issue loading it.
         """
+        search_path = _config_files()
+        # Absolute, so a changed working directory counts as a new search path
+        search_key = tuple(map(os.path.abspath, search_path))
+        if search_key == self._empty_search_path:
+            self.console.debug("No configuration file present; using default settings.")
+            return self.settings
+
         config_loaded = False
+        config_found = False
+
+        for config_file in search_path:
+            try:
+                file_stat = os.stat(config_file)
+            except OSError:
+                file_stat = None
+            if file_stat is not None and stat.S_ISREG(file_stat.st_mode):
+                config_found = True
+                cache_path = os.path.abspath(config_file)
+                cache_key = (file_stat.st_mtime_ns, file_stat.st_size)
+                cached = ConfigManager._parse_cache.get(cache_path)
+                if cached is not None and cached[0] == cache_key:
+                    # Unchanged since the last parse; settings are immutable,
+                    # so the cached instance can be shared
+                    self.settings = cached[1]
+                    self.console.debug(f"Using cached configuration: {config_file}")
+                    config_loaded = True
+                    break
 
-        for config_file in CONFIG_FILES:
-            if os.path.isfile(config_file):
                 self.console.debug(f"Attempting to load config: {config_file}")
                 try:
                     with open(config_file, "rb") as f:
-                        config_data = tomllib.load(f)
+                        raw_config = f.read()
+
+                    if _is_comments_only(raw_config):
+                        # Nothing is set (e.g. every setting commented out);
+                        # treated like an empty file without parsing
+                        config_data = {}
+                    else:
+                        # Imported here: runs that hit the parse cache never parse TOML
+                        import tomllib
+
+                        config_data = tomllib.loads(raw_config.decode("utf-8"))
 
                     if config_data:
+                        unknown = config_data.keys() - _VALID_KEYS
+                        if unknown:
+                            self.console.warning(
+                                f"Ignoring unknown settings in '{config_file}': "
+                                + ", ".join(sorted(unknown))
+                            )
                         try:
                             # Validate and update settings
-                            new_settings = ServerSettings(**config_data)
+                            new_settings = _settings_from_dict(config_data)
                             self.settings = new_settings  # Update instance settings
+                            ConfigManager._parse_cache[cache_path] = (
+                                cache_key,
+                                new_settings,
+                            )
                             self.console.info(
                                 f"Successfully loaded configuration from {config_file}"
                             )
                             config_loaded = True
                             break  # Stop after loading the highest priority file
-                        except ValidationError as validation_error:
+                        except ValueError as validation_error:
                             # Raise a specific ConfigError for validation issues
                             err_msg = f"Validation error in configuration file '{config_file}': {validation_error}"
                             self.console.error(err_msg)
@@ -118,8 +384,8 @@ class ConfigManager:
                     self.console.warning(
                         f"Could not read config file '{config_file}': {e}"
                     )
-                except tomllib.TOMLDecodeError as e:
-                    # Invalid TOML syntax
+                except ValueError as e:
+                    # Invalid TOML syntax (tomllib.TOMLDecodeError) or not UTF-8
                     err_msg = f"Error parsing TOML in config file '{config_file}': {e}"
                     self.console.error(err_msg)
                     raise ConfigError(err_msg) from e
@@ -139,11 +405,30 @@ class ConfigManager:
             self.console.info(
                 "No configuration file found or loaded. Using default settings."
             )
+            self._empty_search_path = None if config_found else search_key
         # else: # Debug log seems redundant if info log above states success
         # self.console.debug(f"Final configuration loaded from: {loaded_path}")
 
         return self.settings
 
+    def reload(self, force: bool = True) -> ServerSettings:
+        """Loads the configuration again, e.g. after a config file was created.
+
+        Args:
+            force: Forget that no config file was found earlier and probe the
+                   search path again. Edited files are always picked up.
+
+        Returns:
+            The validated ServerSettings instance.
+
+        Raises:
+            ConfigError: As for load_config.
+        """
+        if force:
+            self._empty_search_path = None
+            self.settings = _DEFAULT_SETTINGS
+        return self.load_config()
+
     def generate_config_file(self) -> str:
         """Generates a default configuration file in the primary XDG location.
 
@@ -156,8 +441,8 @@ class ConfigManager:
             ConfigError: If the directory or file cannot be created due to permissions
                          or other OS-level issues.
         """
-        config_dir = os.path.dirname(XDG_CONFIG_PATH)
-        config_file = XDG_CONFIG_PATH
+        config_file = _xdg_config_path()
+        config_dir = os.path.dirname(config_file)
         self.console.info(f"Attempting to generate default config at: {config_file}")
 
         # Create the config directory
@@ -169,42 +454,21 @@ class ConfigManager:
             self.console.error(err_msg)
             raise ConfigError(err_msg) from e
 
-        # Write the default config file content
-        config_content = f"""# Vintage Story Server Management Script - Configuration File
-# This file was generated automatically. You can edit it to change settings.
-# Configuration files are loaded in this priority order:
-#   1. /etc/vs_manage.toml
-#   2. {XDG_CONFIG_PATH}
-#   3. ./vs_manage.toml
-
-# Service settings
-service_name = "{self.settings.service_name}"
-
-# Directory settings
-server_dir = "{self.settings.server_dir}"
-data_dir = "{self.settings.data_dir}"
-temp_dir = "{self.settings.temp_dir}"
-backup_dir = "{self.settings.backup_dir}"
-log_dir = "{self.settings.log_dir}"
-
-# User settings
-server_user = "{self.settings.server_user}"
-
-# Backup settings
-max_backups = {self.settings.max_backups}
-
-# Version checking settings
-downloads_base_url = "{self.settings.downloads_base_url}"
-game_version_api_url = "{self.settings.game_version_api_url}"
-
-# Archive settings
-server_archive_format = "{self.settings.server_archive_format}"
-extracted_dir_name = "{self.settings.extracted_dir_name}"
-"""
+        # Fill in the template from one dump of the settings
+        values = {
+            name: _toml_value(value)
+            for name, value in dataclasses.asdict(self.settings).items()
+            if value is not None
+        }
+        values["config_path"] = config_file
+        values["dict_path"] = _toml_value(
+            os.path.join(self.settings.backup_dir, "vs_data.dict")
+        )
+        config_content = CONFIG_TEMPLATE.format_map(values)
 
         try:
-            with open(config_file, "w", encoding="utf-8") as f:
-                f.write(config_content)
+            write_file_atomic(config_file, config_content.encode("utf-8"))
+            self._empty_search_path = None
 
             self.console.info(
                 f"Successfully generated configuration file: {config_file}"
@@ -0,0 +1,82 @@
+"""Small file and path helpers shared by the configuration and API caches."""
+
+import functools
+import os
+from typing import Optional
+
+
+@functools.lru_cache(maxsize=None)
+def xdg_path(
+    base_dir: Optional[str], home: Optional[str], default_subdir: str, *parts: str
+) -> str:
+    """Joins parts onto an XDG base directory, defaulting to one under home.
+
+    Args:
+        base_dir: Value of the XDG_*_HOME variable, if set.
+        home: Value of $HOME, if set (otherwise os.path.expanduser is asked).
+        default_subdir: Base directory relative to home when base_dir is unset.
+        *parts: Path components below the base directory.
+    """
+    if not base_dir:
+        base_dir = os.path.join(home or os.path.expanduser("~"), default_subdir)
+    return os.path.join(base_dir, *parts)
+
+
+def _write_all(fd: int, data: bytes) -> None:
+    """Writes all of data to a file descriptor, retrying short writes."""
+    view = memoryview(data)
+    while view:
+        view = view[os.write(fd, view) :]
+
+
+def write_file_atomic(path: str, data: bytes) -> None:
+    """Writes a file so that it either appears complete or not at all.
+
+    On Linux the data goes into an unnamed O_TMPFILE inode that is only linked
+    into the directory once fully written, so an interrupted write leaves
+    nothing behind. Where that is unsupported (other platforms, filesystems
+    without O_TMPFILE, no /proc) a temporary file next to the target is used
+    instead. An existing file is replaced with a single rename.
+
+    Raises:
+        OSError: If the file cannot be written.
+    """
+    directory = os.path.dirname(path) or "."
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+
+    if hasattr(os, "O_TMPFILE"):
+        try:
+            fd = os.open(directory, os.O_TMPFILE | os.O_WRONLY, 0o644)
+        except OSError:
+            fd = None
+        if fd is not None:
+            try:
+                _write_all(fd, data)
+                fd_path = f"/proc/self/fd/{fd}"
+                try:
+                    try:
+                        os.link(fd_path, path, follow_symlinks=True)
+                    except FileExistsError:
+                        os.link(fd_path, tmp_path, follow_symlinks=True)
+                        os.replace(tmp_path, path)
+                    return
+                except OSError:
+                    # Cannot link the inode here; use a named file below
+                    if os.path.lexists(tmp_path):
+                        os.remove(tmp_path)
+            finally:
+                os.close(fd)
+
+    fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o644)
+    try:
+        try:
+            _write_all(fd, data)
+        finally:
+            os.close(fd)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except FileNotFoundError:
+            pass
+        raise
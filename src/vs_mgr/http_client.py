@@ -1,14 +1,57 @@
 import requests
-from typing import Union, Any
+from requests.adapters import HTTPAdapter
+from typing import Union, Any, Tuple
 from pathlib import Path
 import os
 import shutil
+from urllib3.util.retry import Retry
 
 from vs_mgr.interfaces import IHttpClient
 
+# Bytes copied per read/write while downloading; large enough that a server
+# archive takes a few hundred iterations rather than thousands
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+# (connect, read) timeout in seconds: how long to wait for a connection and,
+# once connected, for each chunk of the response (not the whole download)
+DEFAULT_TIMEOUT = (10.0, 60.0)
+# Transient gateway errors are retried with a short exponential backoff
+RETRY_STATUSES = (502, 503, 504)
+
 
 class RequestsHttpClient(IHttpClient):
-    """Implementation of IHttpClient using requests library."""
+    """Implementation of IHttpClient using requests library.
+
+    All requests go through one session, so the API call, the download URL
+    check and the download itself reuse pooled keep-alive connections instead
+    of a TCP and TLS handshake each.
+    """
+
+    def __init__(
+        self,
+        retries: int = 3,
+        backoff_factor: float = 0.3,
+        timeout: Tuple[float, float] = DEFAULT_TIMEOUT,
+    ):
+        """Initialize the client and its connection pool.
+
+        Args:
+            retries: Attempts for failed connections and gateway errors
+            backoff_factor: Base delay in seconds between retries
+            timeout: (connect, read) timeout in seconds for every request, so
+                an unresponsive server cannot stall an update indefinitely
+        """
+        self.timeout = timeout
+        retry = Retry(
+            total=retries,
+            backoff_factor=backoff_factor,
+            status_forcelist=RETRY_STATUSES,
+            # Hand the last response back so callers still see its status code
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=8, max_retries=retry)
+        self._session = requests.Session()
+        self._session.mount("https://", adapter)
+        self._session.mount("http://", adapter)
 
     def get(self, url: str, stream: bool = False) -> Any:
         """Perform HTTP GET request.
@@ -20,7 +63,7 @@ class RequestsHttpClient(IHttpClient):
         Returns:
             Response object with content, status_code attributes
         """
-        return requests.get(url, stream=stream)
+        return self._session.get(url, stream=stream, timeout=self.timeout)
 
     def head(self, url: str) -> Any:
         """Perform HTTP HEAD request.
@@ -31,7 +74,23 @@ class RequestsHttpClient(IHttpClient):
         Returns:
             Response object with headers, status_code attributes
         """
-        return requests.head(url)
+        return self._session.head(url, timeout=self.timeout)
+
+    def get_range(self, url: str, start: int, end: int) -> Any:
+        """Perform HTTP GET request for a byte range of a resource.
+
+        Args:
+            url: The URL to request
+            start: Offset of the first byte to fetch
+            end: Offset of the last byte to fetch (inclusive)
+
+        Returns:
+            Streamed response object with content, status_code attributes
+        """
+        headers = {"Range": f"bytes={start}-{end}"}
+        return self._session.get(
+            url, headers=headers, stream=True, timeout=self.timeout
+        )
 
     def download(self, url: str, dest_path: Union[str, Path]) -> bool:
         """Download a file from a URL to a destination path.
@@ -50,11 +109,14 @@ class RequestsHttpClient(IHttpClient):
                 os.makedirs(dest_dir)
 
             # Stream download to handle large files efficiently
-            with requests.get(url, stream=True) as response:
+            with self._session.get(url, stream=True, timeout=self.timeout) as response:
                 response.raise_for_status()
 
+                # Reading the raw stream keeps the copy loop in C; let urllib3
+                # undo any Content-Encoding as iter_content would
+                response.raw.decode_content = True
                 with open(dest_path, "wb") as f:
-                    shutil.copyfileobj(response.raw, f)
+                    shutil.copyfileobj(response.raw, f, DOWNLOAD_CHUNK_SIZE)
 
             return True
         except (requests.RequestException, IOError, OSError) as e:
@@ -1,7 +1,38 @@
-from typing import Protocol, List, Any, Union, Optional, Tuple
+from typing import (
+    Protocol,
+    List,
+    Any,
+    Iterator,
+    Union,
+    Optional,
+    Tuple,
+    BinaryIO,
+    ContextManager,
+    Pattern,
+)
+from dataclasses import dataclass
 from pathlib import Path
 
 
+@dataclass(slots=True, frozen=True)
+class StatResult:
+    """The commonly needed fields of a single stat call.
+
+    Attributes:
+        exists: Whether the path exists
+        is_dir: Whether the path is a directory
+        is_file: Whether the path is a regular file
+        mtime: Modification time as seconds since epoch (0.0 if missing)
+        size: Size in bytes (0 if missing)
+    """
+
+    exists: bool
+    is_dir: bool
+    is_file: bool
+    mtime: float
+    size: int
+
+
 class IHttpClient(Protocol):
     """Protocol for HTTP client operations."""
 
@@ -28,6 +59,22 @@ class IHttpClient(Protocol):
         """
         ...
 
+    def get_range(self, url: str, start: int, end: int) -> Any:
+        """Perform HTTP GET request for a byte range of a resource.
+
+        Args:
+            url: The URL to request
+            start: Offset of the first byte to fetch
+            end: Offset of the last byte to fetch (inclusive)
+
+        Returns:
+            Streamed response object with content, status_code attributes.
+            The status is 206 if the server honoured the range; a server that
+            ignores it answers 200 with the full body, which is not read
+            until accessed.
+        """
+        ...
+
     def download(self, url: str, dest_path: Union[str, Path]) -> bool:
         """Download a file from a URL to a destination path.
 
@@ -116,6 +163,21 @@ class IFileSystem(Protocol):
         """
         ...
 
+    def chown_ids(self, path: Union[str, Path], uid: int, gid: int) -> bool:
+        """Change ownership of a file or directory to numeric ids.
+
+        Unlike chown, no user or group name has to be resolved.
+
+        Args:
+            path: Path to change ownership of
+            uid: User id to set as owner
+            gid: Group id to set as owner
+
+        Returns:
+            True if successful, False otherwise
+        """
+        ...
+
     def copy(self, src: Union[str, Path], dst: Union[str, Path]) -> None:
         """Copy a file or directory.
 
@@ -205,20 +267,95 @@ class IFileSystem(Protocol):
         """
         ...
 
-    def walk(self, path: Union[str, Path]) -> List[Tuple[str, List[str], List[str]]]:
-        """Walk a directory tree.
+    def stat(self, path: Union[str, Path], follow_symlinks: bool = True) -> StatResult:
+        """Get existence, type, mtime and size of a path with one system call.
+
+        Prefer this over several of exists/isdir/getmtime/getsize on one path.
+
+        Args:
+            path: Path to check
+            follow_symlinks: If False, a symlink is described itself, so a
+                symlink to a directory is not reported as a directory
+
+        Returns:
+            StatResult for the path (exists=False if it does not exist)
+        """
+        ...
+
+    def content_hash(self, path: Union[str, Path], algo: str = "sha256") -> bytes:
+        """Hash the contents of a file.
+
+        Args:
+            path: Path to the file to hash
+            algo: Name of a hashlib algorithm
+
+        Returns:
+            The binary digest of the file's contents
+        """
+        ...
+
+    def remove_if_exists(self, path: Union[str, Path]) -> bool:
+        """Remove a file if it exists.
+
+        Args:
+            path: Path to the file to remove
+
+        Returns:
+            True if the file was removed, False if it did not exist
+        """
+        ...
+
+    def scandir_files(
+        self, path: Union[str, Path], name_pattern: Optional[Pattern[str]] = None
+    ) -> List[Tuple[str, float, int]]:
+        """List regular files in a directory with their stat data in one pass.
+
+        Args:
+            path: Directory to scan (not recursive)
+            name_pattern: Optional compiled regex; only names it matches are returned
+
+        Returns:
+            List of (absolute_path, modification_time, size_in_bytes) tuples
+        """
+        ...
+
+    def scandir_dirs(
+        self, path: Union[str, Path], name_pattern: Optional[Pattern[str]] = None
+    ) -> List[Tuple[str, float]]:
+        """List subdirectories of a directory with their mtimes in one pass.
+
+        Args:
+            path: Directory to scan (not recursive)
+            name_pattern: Optional compiled regex; only names it matches are returned
+
+        Returns:
+            List of (absolute_path, modification_time) tuples
+        """
+        ...
+
+    def walk(
+        self, path: Union[str, Path]
+    ) -> Iterator[Tuple[str, List[str], List[str]]]:
+        """Walk a directory tree lazily, top-down.
+
+        As with os.walk, removing names from dirnames prunes the walk.
 
         Args:
             path: Path to walk
 
         Returns:
-            Generator yielding (dirpath, dirnames, filenames) tuples
+            Iterator yielding (dirpath, dirnames, filenames) tuples
         """
         ...
 
     def calculate_dir_size(self, path: Union[str, Path]) -> int:
         """Calculate the total size of a directory.
 
+        Sums the sizes of all files below path; symbolic links are neither
+        followed nor counted. Implementations should take the file/directory
+        distinction from the directory listing (os.scandir) and stat each file
+        once, rather than walk and then getsize every path.
+
         Args:
             path: Path to calculate size for
 
@@ -248,14 +385,15 @@ class IArchiver(Protocol):
     def create(
         self,
         source_dir: Union[str, Path],
-        archive_path: Union[str, Path],
+        archive_path: Union[str, Path, BinaryIO],
         exclude_patterns: List[str] = [],
     ) -> bool:
         """Create an archive.
 
         Args:
             source_dir: Directory to archive
-            archive_path: Path to save the archive to
+            archive_path: Path to save the archive to, or a writable binary
+                file-like object the archive is streamed into (no seeking)
             exclude_patterns: Patterns to exclude
 
         Returns:
@@ -281,6 +419,43 @@ class ICompressor(Protocol):
         """
         ...
 
+    def stream_writer(
+        self,
+        dest_path: Union[str, Path],
+        size_hint: int = 0,
+        owner: Optional[Tuple[int, int]] = None,
+    ) -> ContextManager[BinaryIO]:
+        """Open a writable stream that compresses into a file.
+
+        Bytes written to the stream are compressed on the fly, so callers can
+        produce data (e.g. a tar archive) without staging it on disk first.
+
+        Args:
+            dest_path: Path to save the compressed file to
+            size_hint: Estimated number of bytes that will be written (0 = unknown)
+            owner: Optional (uid, gid) to give the file (requires privileges)
+
+        Returns:
+            Context manager yielding a writable binary file-like object
+        """
+        ...
+
+    def command_line(
+        self, size_hint: int = 0, dict_path: Optional[str] = None
+    ) -> List[str]:
+        """Build an external compressor command with the same settings.
+
+        Used where another program (e.g. tar) runs the compression itself.
+
+        Args:
+            size_hint: Estimated number of input bytes (0 = unknown)
+            dict_path: Optional dictionary file to compress with
+
+        Returns:
+            A command filtering stdin to stdout, as a list of arguments
+        """
+        ...
+
     def decompress(
         self, source_path: Union[str, Path], dest_path: Union[str, Path]
     ) -> bool:
@@ -48,8 +48,9 @@ class SubprocessProcessRunner(IProcessRunner):
         Returns:
             CompletedProcess object with returncode, stdout, stderr attributes
         """
-        # Only add sudo if not running as root and not on Windows
+        # Only add sudo if not running as root and not on Windows; -n makes sudo
+        # fail instead of waiting for a password nobody is there to type
         if os.name != "nt" and os.geteuid() != 0:
-            command_args = ["sudo"] + command_args
+            command_args = ["sudo", "-n", *command_args]
 
         return self.run(command_args, check, capture_output, cwd)
@@ -1,7 +1,13 @@
 """Manages interactions with system services, primarily systemd, via a process runner."""
 
+import os
 import time
-from typing import TYPE_CHECKING, Literal
+from typing import TYPE_CHECKING, Dict, Literal, Optional
+
+try:
+    from pystemd.systemd1 import Unit as SystemdUnit
+except ImportError:  # Optional: without pystemd, systemctl is run instead
+    SystemdUnit = None
 
 from vs_mgr.interfaces import IProcessRunner
 from vs_mgr.errors import ServiceError, ProcessError
@@ -13,6 +19,18 @@ if TYPE_CHECKING:
 # Define a type for service status
 ServiceStatus = Literal["running", "stopped", "not-found", "error"]
 
+# Unit properties read by ServiceManager with a single `systemctl show`
+SHOW_PROPERTIES = ("ActiveState", "LoadState")
+# Standard unit file directories; a unit file found here needs no systemctl call
+UNIT_FILE_DIRS = (
+    "/etc/systemd/system",
+    "/run/systemd/system",
+    "/usr/lib/systemd/system",
+    "/lib/systemd/system",
+)
+# First delay between polls of a starting service; doubled after each poll
+POLL_INITIAL_DELAY = 0.5
+
 
 class ServiceManager:
     """Provides methods to control and query systemd services.
@@ -52,9 +70,10 @@ class ServiceManager:
                 check=False,  # Don't raise on non-zero, check stdout/return code
                 capture_output=True,
             )
-            # Decode stdout bytes to string
-            output = result.stdout.decode("utf-8").strip() if result.stdout else ""
-            return output
+            output = result.stdout or ""
+            if isinstance(output, bytes):
+                output = output.decode("utf-8")
+            return output.strip()
         except ProcessError as e:
             # Log if process runner itself failed (e.g., systemctl not found)
             self.console.error(f"Failed to run systemctl command {' '.join(args)}: {e}")
@@ -65,9 +84,66 @@ class ServiceManager:
             )
             raise ServiceError(f"Unexpected error querying service status: {e}") from e
 
+    def _unit_properties_dbus(self, service_name: str) -> Optional[Dict[str, str]]:
+        """Reads SHOW_PROPERTIES of a service from systemd over D-Bus.
+
+        Args:
+            service_name: The name of the service (without .service).
+
+        Returns:
+            The properties, or None if pystemd is not installed or the query
+            failed (e.g. no system bus), so the caller can use systemctl.
+        """
+        if SystemdUnit is None:
+            return None
+        try:
+            unit = SystemdUnit(f"{service_name}.service".encode(), _autoload=True)
+            return {name: getattr(unit.Unit, name).decode() for name in SHOW_PROPERTIES}
+        except Exception as e:
+            self.console.debug(f"D-Bus query failed, falling back to systemctl: {e}")
+            return None
+
+    def _unit_properties(self, service_name: str) -> Dict[str, str]:
+        """Reads the load and active state of a service without a process per field.
+
+        Asks systemd directly over D-Bus when pystemd is available, which
+        avoids spawning anything; otherwise runs one `systemctl show`.
+
+        Args:
+            service_name: The name of the service (without .service).
+
+        Returns:
+            Mapping of the SHOW_PROPERTIES names to their values, e.g.
+            {"ActiveState": "active", "LoadState": "loaded"}. A unit without a
+            unit file has LoadState "not-found".
+
+        Raises:
+            ServiceError: If systemctl cannot be run.
+        """
+        properties = self._unit_properties_dbus(service_name)
+        if properties is not None:
+            return properties
+        output = self._run_systemctl_status_check(
+            [
+                "systemctl",
+                "show",
+                f"--property={','.join(SHOW_PROPERTIES)}",
+                f"{service_name}.service",
+            ]
+        )
+        properties = {}
+        for line in output.splitlines():
+            key, sep, value = line.partition("=")
+            if sep:
+                properties[key] = value
+        return properties
+
     def check_service_exists(self, service_name: str) -> bool:
         """Checks if the systemd service unit file exists.
 
+        Looks in the standard unit directories first and only asks systemd
+        when the file is not there.
+
         Args:
             service_name: The name of the service (without .service).
 
@@ -79,12 +155,14 @@ class ServiceManager:
         """
         unit_name = f"{service_name}.service"
         self.console.debug(f"Checking existence of unit file: {unit_name}")
+        for unit_dir in UNIT_FILE_DIRS:
+            if os.path.exists(os.path.join(unit_dir, unit_name)):
+                self.console.debug(f"Unit file '{unit_name}' found in {unit_dir}")
+                return True
         try:
-            # 'list-unit-files' output includes the unit name if it exists
-            output = self._run_systemctl_status_check(
-                ["systemctl", "list-unit-files", unit_name]
-            )
-            exists = unit_name in output
+            # Units elsewhere (e.g. generated or linked) are known to systemd
+            load_state = self._unit_properties(service_name).get("LoadState")
+            exists = load_state not in (None, "not-found")
             self.console.debug(f"Unit file '{unit_name}' exists: {exists}")
             return exists
         except ServiceError:
@@ -148,44 +226,26 @@ class ServiceManager:
         """
         unit_name = f"{service_name}.service"
         self.console.debug(f"Checking active state for service: {unit_name}")
-        try:
-            # 'is-active' returns exit code 0 and prints "active" if active
-            result = self.process_runner.run(
-                ["systemctl", "is-active", unit_name],
-                check=False,  # is-active returns non-zero for inactive states
-                capture_output=True,
-            )
-            # Check both exit code and stdout for robustness
-            stdout_str = result.stdout.decode("utf-8").strip() if result.stdout else ""
-            is_active = result.returncode == 0 and stdout_str == "active"
-            self.console.debug(f"Service '{unit_name}' active state: {is_active}")
-            return is_active
-        except ProcessError as e:
-            # If the runner itself failed (e.g., systemctl not found)
-            self.console.error(f"Failed to check active state for '{unit_name}': {e}")
-            raise ServiceError(
-                f"Failed to check active state for '{unit_name}': {e}"
-            ) from e
-        except Exception as e:
-            # Catch other unexpected errors, assume inactive
-            self.console.warning(
-                f"Could not determine active state for service '{unit_name}': {e}. Assuming inactive.",
-                exc_info=False,  # Don't need full traceback for a warning
-            )
-            return False
+        is_active = self._unit_properties(service_name).get("ActiveState") == "active"
+        self.console.debug(f"Service '{unit_name}' active state: {is_active}")
+        return is_active
 
     def wait_for_service_active(
         self, service_name: str, max_attempts: int = 5, wait_time: int = 3
     ) -> bool:
         """Waits for a service to become active, checking periodically.
 
+        Polls quickly at first (POLL_INITIAL_DELAY, doubling up to wait_time
+        between checks), so a service that starts fast is noticed fast, and
+        gives up after max_attempts * wait_time seconds.
+
         Args:
             service_name: The name of the service (without .service).
-            max_attempts: Maximum number of times to check the status.
-            wait_time: Seconds to wait between attempts.
+            max_attempts: Together with wait_time, how long to wait in total.
+            wait_time: Longest delay in seconds between two checks.
 
         Returns:
-            True if the service becomes active within the attempts, False otherwise.
+            True if the service becomes active in time, False otherwise.
 
         Raises:
             ServiceError: If a status check command fails unexpectedly during polling.
@@ -193,7 +253,10 @@ class ServiceManager:
         unit_name = f"{service_name}.service"
         self.console.info(f"Waiting for service '{unit_name}' to become active...")
 
-        for i in range(1, max_attempts + 1):
+        timeout = max_attempts * wait_time
+        deadline = time.monotonic() + timeout
+        delay = min(POLL_INITIAL_DELAY, wait_time)
+        while True:
             try:
                 if self.is_service_active(service_name):
                     self.console.info(f"Service '{unit_name}' is active.")
@@ -203,29 +266,28 @@ class ServiceManager:
                 self.console.error(f"Error checking service status during wait: {e}")
                 raise
 
-            if i < max_attempts:
-                self.console.debug(
-                    f"Service not active yet. Waiting {wait_time}s... (Attempt {i}/{max_attempts})"
-                )
-                time.sleep(wait_time)
-            else:
-                self.console.warning(
-                    f"Service '{unit_name}' did not become active after {max_attempts} checks ({max_attempts * wait_time} seconds)."
-                )
-                # Suggest manual check
-                self.console.warning(
-                    f"Check status manually: sudo systemctl status {unit_name}"
-                )
-                return False
-
-        return (
-            False  # Should not be reached due to the loop logic, but added for clarity
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            delay = min(delay, remaining)
+            self.console.debug(f"Service not active yet. Waiting {delay:.1f}s...")
+            time.sleep(delay)
+            delay = min(delay * 2, wait_time)
+
+        self.console.warning(
+            f"Service '{unit_name}' did not become active within {timeout} seconds."
+        )
+        # Suggest manual check
+        self.console.warning(
+            f"Check status manually: sudo systemctl status {unit_name}"
         )
+        return False
 
     def get_service_status(self, service_name: str) -> ServiceStatus:
         """Determines the overall status of a service.
 
-        Checks if the service is active, then if it exists.
+        Checks if the service is active, then if it exists, from one
+        `systemctl show` call.
 
         Args:
             service_name: The name of the service (without .service).
@@ -236,12 +298,14 @@ class ServiceManager:
         unit_name = f"{service_name}.service"
         self.console.debug(f"Getting comprehensive status for service '{unit_name}'.")
         try:
-            if self.is_service_active(service_name):
+            # Both states come from one systemctl call
+            properties = self._unit_properties(service_name)
+            if properties.get("ActiveState") == "active":
                 self.console.debug(f"Service '{unit_name}' determined to be: running")
                 return "running"
 
             # If not active, check if the unit file exists
-            if self.check_service_exists(service_name):
+            if properties.get("LoadState") not in (None, "not-found"):
                 self.console.debug(f"Service '{unit_name}' determined to be: stopped")
                 return "stopped"
             else:
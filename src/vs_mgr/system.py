@@ -7,15 +7,31 @@ and basic permission elevation (sudo) needs.
 """
 
 import os
+import sys
+import ctypes
+import functools
 import shutil
+import platform
 import subprocess
-from typing import List, Optional, Union, TYPE_CHECKING
+from typing import List, Optional, TYPE_CHECKING
 from vs_mgr.interfaces import IProcessRunner, IFileSystem
 from vs_mgr.errors import ProcessError, FileSystemError
 
 if TYPE_CHECKING:
     from vs_mgr.ui import ConsoleManager
 
+# ioprio_set(2) syscall numbers per Linux architecture (no libc wrapper exists)
+IOPRIO_SET_SYSCALLS = {"x86_64": 251, "i686": 289, "aarch64": 30, "armv7l": 314}
+IOPRIO_WHO_PROCESS = 1
+IOPRIO_CLASS_BE = 2
+IOPRIO_CLASS_SHIFT = 13
+
+
+@functools.lru_cache(maxsize=None)
+def _which_cached(command: str, search_path: Optional[str]) -> Optional[str]:
+    """shutil.which, remembered per command and PATH value for the process."""
+    return shutil.which(command, path=search_path)
+
 
 class SystemInterface:
     """Provides methods for interacting with the operating system.
@@ -62,15 +78,17 @@ class SystemInterface:
         )
 
     def run_with_sudo(
-        self, cmd: Union[List[str], str], check: bool = True, **kwargs
+        self, cmd: List[str], check: bool = True, **kwargs
     ) -> subprocess.CompletedProcess:
-        """Executes a command, prepending 'sudo' if not running as root.
+        """Executes a command, prepending 'sudo -n' if not running as root.
 
         Delegates to `IProcessRunner.run_sudo` if available, otherwise uses `subprocess`.
-        Handles dry-run mode.
+        The command is always executed directly, never through a shell, and sudo
+        runs non-interactively so a missing sudoers rule fails instead of hanging
+        on a password prompt. Handles dry-run mode.
 
         Args:
-            cmd: The command to run, either as a string or list of strings.
+            cmd: The command to run as a list of program and arguments.
             check: If True, raises CalledProcessError on non-zero exit code. Defaults to True.
             **kwargs: Additional keyword arguments passed to the underlying run command
                       (e.g., `capture_output=True`, `cwd`).
@@ -82,7 +100,7 @@ class SystemInterface:
             ProcessError: If the command fails (and check=True) or command not found.
             FileNotFoundError: If the command executable is not found (caught and wrapped).
         """
-        cmd_list: List[str] = cmd.split() if isinstance(cmd, str) else list(cmd)
+        cmd_list: List[str] = list(cmd)
         cmd_str = " ".join(cmd_list)
 
         if self.dry_run:
@@ -98,7 +116,7 @@ class SystemInterface:
                 # Assume IProcessRunner returns a CompletedProcess-like object or raises
                 return self.process_runner.run_sudo(cmd_list, check=check, **kwargs)
             else:
-                run_cmd = ["sudo"] + cmd_list if not self.is_root else cmd_list
+                run_cmd = ["sudo", "-n", *cmd_list] if not self.is_root else cmd_list
                 if kwargs.get("capture_output") and "text" not in kwargs:
                     kwargs["text"] = True
                 result = subprocess.run(run_cmd, check=check, **kwargs)
@@ -251,16 +269,61 @@ class SystemInterface:
             else:
                 raise FileSystemError(err_msg) from e
 
+    def lower_priority(self, nice_increment: int, io_priority: int) -> None:
+        """Lowers the CPU and I/O scheduling priority of the calling thread.
+
+        Both are per-thread on Linux and are inherited by threads and processes
+        the thread starts afterwards (e.g. zstd workers, tar). This cannot be
+        undone without privileges, so call it on a thread dedicated to
+        background work. Elsewhere os.nice would lower the whole process, so
+        nothing is changed. Failures are logged and otherwise ignored.
+
+        Args:
+            nice_increment: Amount to add to the nice value (0 = unchanged).
+            io_priority: Best-effort I/O priority level, 0 (highest) to 7
+                (lowest); negative = unchanged. Linux only.
+        """
+        if not sys.platform.startswith("linux"):
+            self.console.debug("Per-thread priorities need Linux; priority unchanged")
+            return
+
+        if nice_increment > 0:
+            try:
+                new_nice = os.nice(nice_increment)
+                self.console.debug(f"Process nice value set to {new_nice}")
+            except OSError as e:
+                self.console.debug(f"Could not lower CPU priority: {e}")
+
+        if io_priority < 0:
+            return
+        syscall_nr = IOPRIO_SET_SYSCALLS.get(platform.machine())
+        if syscall_nr is None:
+            self.console.debug(
+                f"ioprio_set is not known on {platform.machine()}; I/O priority unchanged"
+            )
+            return
+        ioprio = (IOPRIO_CLASS_BE << IOPRIO_CLASS_SHIFT) | min(io_priority, 7)
+        libc = ctypes.CDLL(None, use_errno=True)
+        if libc.syscall(syscall_nr, IOPRIO_WHO_PROCESS, 0, ioprio) != 0:
+            self.console.debug(
+                f"Could not lower I/O priority: {os.strerror(ctypes.get_errno())}"
+            )
+        else:
+            self.console.debug(f"I/O priority set to best-effort level {io_priority}")
+
     def which(self, command: str) -> Optional[str]:
         """Finds the path to an executable command using `shutil.which`.
 
+        Results are cached for the life of the process (per PATH value), so
+        repeated dependency probes do not search PATH again.
+
         Args:
             command: The name of the command to find.
 
         Returns:
             The absolute path to the command, or None if not found in PATH.
         """
-        path = shutil.which(command)
+        path = _which_cached(command, os.environ.get("PATH"))
         self.console.debug(f"shutil.which('{command}') found: {path}")
         return path
 
@@ -287,8 +350,7 @@ class SystemInterface:
     def is_file(self, path: str) -> bool:
         """Checks if the given path exists and is a regular file.
 
-        Uses `IFileSystem.exists` and not `IFileSystem.isdir` if available,
-        otherwise `os.path.isfile`.
+        Uses `IFileSystem.stat` if available, otherwise `os.path.isfile`.
 
         Args:
             path: The path to check.
@@ -298,8 +360,7 @@ class SystemInterface:
         """
         try:
             if self.filesystem:
-                # IFileSystem doesn't have isfile, use exists and not isdir
-                return self.filesystem.exists(path) and not self.filesystem.isdir(path)
+                return self.filesystem.stat(path).is_file
             return os.path.isfile(path)
         except Exception as e:
             self.console.warning(f"Error checking if '{path}' is a file: {e}")
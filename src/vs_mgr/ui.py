@@ -34,6 +34,7 @@ class ConsoleManager:
         self.log_dir: Optional[str] = None
         self.logger = logging.getLogger("vs_manage")  # Use a named logger
         self._logging_configured = False
+        self._log_level: Optional[int] = None
 
         # Basic console config in case setup_logging isn't called or fails
         # This ensures self.console is always usable.
@@ -60,7 +61,11 @@ class ConsoleManager:
             log_level: The minimum logging level (e.g., logging.INFO, logging.DEBUG).
                      Defaults to logging.INFO.
         """
-        if self._logging_configured and self.log_dir == log_dir:
+        if (
+            self._logging_configured
+            and self.log_dir == log_dir
+            and self._log_level == log_level
+        ):
             self.logger.debug(
                 f"Logging already configured for {log_dir}. Skipping setup."
             )
@@ -104,6 +109,7 @@ class ConsoleManager:
         # or interference from libraries that configure the root logger.
         for handler in self.logger.handlers[:]:
             self.logger.removeHandler(handler)
+            handler.close()  # Releases the previous log file, if any
         for handler in logging.root.handlers[:]:
             logging.root.removeHandler(handler)
 
@@ -115,6 +121,7 @@ class ConsoleManager:
         self.logger.propagate = False  # Crucial: Prevent messages flowing to root
 
         self._logging_configured = True
+        self._log_level = log_level
 
         # --- Post-Setup Logging ---
         if self.dry_run:
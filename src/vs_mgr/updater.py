@@ -10,7 +10,6 @@ HTTP requests, filesystem operations, and archiving.
 
 import os
 import time
-import traceback
 from typing import Optional, Tuple, TYPE_CHECKING
 
 from vs_mgr.interfaces import IHttpClient, IFileSystem, IArchiver, IProcessRunner
@@ -196,7 +195,8 @@ class UpdateManager:
             PermissionError,
         ) as e:
             self.console.error(f"UPDATE FAILED: {e}", exc_info=False)
-            self.console.debug(traceback.format_exc())  # Use imported traceback
+            # Full traceback at debug level; only formatted if debug logging is on
+            self.console.debug("Update failure traceback:", exc_info=True)
             self.console.error("=== Update Process Failed ===")
             success = False
         except Exception as e:
@@ -319,8 +319,8 @@ class UpdateManager:
             # Use the renamed method from ServiceManager
             self.service_mgr.run_systemctl_action("stop", self.service_name)
             self.server_stopped = True
-            # Optional: Add a short delay or check status to confirm stop
-            time.sleep(2)
+            # systemctl stop waits for the stop job to finish, so the state
+            # can be confirmed right away
             if self.service_mgr.is_service_active(self.service_name):
                 self.console.warning(
                     f"Service '{self.service_name}' still reported as active after stop command."
@@ -664,16 +664,17 @@ class UpdateManager:
                     dst_filepath = os.path.join(dst_dirpath, filename)
                     should_copy = False
 
-                    if not self.filesystem.exists(dst_filepath):
+                    # One stat answers both "exists?" and "newer?" for the target
+                    dst_stat = self.filesystem.stat(dst_filepath)
+                    if not dst_stat.exists:
                         should_copy = True
                         action = "copying"
                         copied_count += 1
                     else:
                         # Compare modification times (basic check)
                         try:
-                            src_mtime = self.filesystem.getmtime(src_filepath)
-                            dst_mtime = self.filesystem.getmtime(dst_filepath)
-                            if src_mtime > dst_mtime:
+                            src_mtime = self.filesystem.stat(src_filepath).mtime
+                            if src_mtime > dst_stat.mtime:
                                 should_copy = True
                                 action = "updating"
                                 updated_count += 1
@@ -683,11 +684,7 @@ class UpdateManager:
                             )
                             should_copy = True
                             action = "copying (mtime error)"
-                            # Avoid double counting if exists check failed
-                            if not self.filesystem.exists(dst_filepath):
-                                copied_count += 1
-                            else:
-                                updated_count += 1
+                            updated_count += 1
 
                     if should_copy:
                         self.console.debug(
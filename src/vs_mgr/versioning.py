@@ -5,14 +5,18 @@ and verifies download URLs. Also provides methods to determine the currently
 installed server version by checking log files.
 """
 
+import functools
 import os
 import re
 import json
 import requests
 import shutil
+import stat
 import tempfile
-from typing import Optional, Dict, TYPE_CHECKING, Any
+import time
+from typing import Iterator, Optional, Dict, Set, TYPE_CHECKING, Any
 from packaging import version as packaging_version
+from vs_mgr.fileio import write_file_atomic, xdg_path
 from vs_mgr.interfaces import IHttpClient, IProcessRunner
 from vs_mgr.errors import VersioningError, ProcessError
 
@@ -20,6 +24,81 @@ if TYPE_CHECKING:
     from vs_mgr.ui import ConsoleManager
     from vs_mgr.config import ServerSettings
 
+# Version as reported in the server log ("Game Version: v1.19.4")
+LOG_VERSION_RE = re.compile(r"(v\d+\.\d+\.\d+)")
+# Version as returned by the API for a channel ("1.19.4", "1.20.0-rc.1")
+API_VERSION_RE = re.compile(r"^\d+\.\d+(\.\d+)?(-\w+\.\d+)?$")
+# Bytes read per step when scanning the server log from its end
+LOG_TAIL_BLOCK_SIZE = 64 * 1024
+
+
+def _api_cache_path() -> str:
+    """Path of the on-disk cache of version API responses and URL checks."""
+    env = os.environ
+    return xdg_path(
+        env.get("XDG_CACHE_HOME"),
+        env.get("HOME"),
+        ".cache",
+        "vs_manage",
+        "api_cache.json",
+    )
+
+
+@functools.lru_cache(maxsize=256)
+def _parse_version(version_str: str) -> packaging_version.Version:
+    """Parses a version string, remembering the result.
+
+    Version objects are immutable, and the same few version strings (installed,
+    latest, requested) are compared repeatedly.
+
+    Raises:
+        packaging.version.InvalidVersion: If version_str is not a valid version.
+    """
+    return packaging_version.parse(version_str)
+
+
+def _tail_lines(path: str, block_size: int = LOG_TAIL_BLOCK_SIZE) -> Iterator[str]:
+    """Yields the lines of a text file from last to first.
+
+    The file is read backwards in blocks, so finding something near the end of
+    a large log only reads the end of it.
+
+    Args:
+        path: File to read (decoded as UTF-8, undecodable bytes dropped).
+        block_size: Number of bytes read per step.
+    """
+    with open(path, "rb") as f:
+        position = f.seek(0, os.SEEK_END)
+        partial = b""  # Start of a line whose beginning is in an earlier block
+        while position > 0:
+            read_size = min(block_size, position)
+            position -= read_size
+            f.seek(position)
+            lines = (f.read(read_size) + partial).split(b"\n")
+            # The first piece may continue in the previous block
+            partial = lines.pop(0)
+            for line in reversed(lines):
+                yield line.decode("utf-8", errors="ignore")
+        yield partial.decode("utf-8", errors="ignore")
+
+
+@functools.lru_cache(maxsize=8)
+def _log_version(path: str, mtime_ns: int, size: int) -> Optional[str]:
+    """Returns the last "Game Version: vX.Y.Z" reported in a server log.
+
+    Keyed on the log's mtime and size, so the log is only scanned again once
+    the server has written to it (an update verifies the version repeatedly).
+
+    Raises:
+        OSError: If the log cannot be read.
+    """
+    for line in _tail_lines(path):
+        if "Game Version: v" in line:
+            match = LOG_VERSION_RE.search(line)
+            if match:
+                return match.group(1)
+    return None
+
 
 class VersionChecker:
     """Provides methods for version checking, comparison, and verification.
@@ -33,6 +112,7 @@ class VersionChecker:
         console (ConsoleManager): Interface for logging and console output.
         downloads_base_url (str): Base URL for server downloads.
         game_version_api_url (str): URL for the game version API.
+        api_cache_ttl (int): Seconds cached API responses and URL checks stay valid.
         jq_path (Optional[str]): Path to the jq executable, if found.
     """
 
@@ -61,6 +141,16 @@ class VersionChecker:
         # Get URLs from ServerSettings
         self.downloads_base_url = settings.downloads_base_url
         self.game_version_api_url = settings.game_version_api_url
+        self.api_cache_ttl = settings.api_cache_ttl
+        # The cache lives in a user-writable directory: as root, neither trust
+        # it nor leave a root-owned cache directory behind
+        self._use_api_cache = self.api_cache_ttl > 0 and not (
+            hasattr(os, "geteuid") and os.geteuid() == 0
+        )
+        # Entries of the on-disk API cache, read on first use
+        self._api_cache: Optional[Dict[str, Any]] = None
+        # Download URLs already verified by this process, whatever the TTL
+        self._verified_urls: Set[str] = set()
 
         # Find jq path
         self.jq_path = shutil.which("jq")
@@ -125,8 +215,8 @@ class VersionChecker:
         )
 
         try:
-            v1 = packaging_version.parse(ver1_norm)
-            v2 = packaging_version.parse(ver2_norm)
+            v1 = _parse_version(ver1_norm)
+            v2 = _parse_version(ver2_norm)
 
             if v1 < v2:
                 return -1
@@ -268,20 +358,41 @@ class VersionChecker:
             download_url: The URL to check.
 
         Returns:
-            True if the URL returns a 2xx status code to a HEAD request, False otherwise.
+            True if the URL answers a HEAD request with status 200 (or, where
+            HEAD is not allowed, a one-byte range request with 200/206),
+            False otherwise.
 
         Raises:
             VersioningError: If the HTTP request itself fails unexpectedly.
         """
+        if download_url in self._verified_urls:
+            # e.g. get_latest_version checked it before an update is started
+            self.console.debug(f"Download URL already verified: {download_url}")
+            return True
+        cache_key = f"HEAD {download_url}"
+        if self._get_cached(cache_key) in (200, 206):
+            self._verified_urls.add(download_url)
+            self.console.debug(
+                f"Download URL verified recently (cached): {download_url}"
+            )
+            return True
+
         self.console.debug(
             f"Verifying download URL availability (HEAD request): {download_url}"
         )
         try:
             response = self.http_client.head(download_url)
-            if response.status_code == 200:
+            if response.status_code == 405:
+                # HEAD not allowed: probe the first byte instead of the archive
+                response = self.http_client.get_range(download_url, 0, 0)
+                response.close()
+            if response.status_code in (200, 206):
                 self.console.debug(
                     f"Download URL verified successfully (Status: {response.status_code})."
                 )
+                # Only successes are cached: a missing file may be uploaded soon
+                self._verified_urls.add(download_url)
+                self._store_cached(cache_key, response.status_code)
                 return True
             else:
                 self.console.warning(
@@ -319,11 +430,19 @@ class VersionChecker:
 
         self.console.debug(f"Looking for log file at: {log_file}")
 
-        if not os.path.isfile(log_file):
+        try:
+            log_stat = os.stat(log_file)
+        except OSError:
+            log_stat = None
+        if log_stat is None or not stat.S_ISREG(log_stat.st_mode):
             self.console.debug(f"Log file not found at: {log_file}")
             # Try alternative common location (less ideal)
             alt_log_file = "/srv/gameserver/data/vs/Logs/server-main.log"
-            if os.path.isfile(alt_log_file):
+            try:
+                log_stat = os.stat(alt_log_file)
+            except OSError:
+                log_stat = None
+            if log_stat is not None and stat.S_ISREG(log_stat.st_mode):
                 log_file = alt_log_file
                 self.console.debug(
                     f"Found log file at alternative location: {log_file}"
@@ -333,20 +452,13 @@ class VersionChecker:
                 return None
 
         try:
-            with open(log_file, "r", encoding="utf-8", errors="ignore") as f:
-                # Read lines in reverse for efficiency, hoping version is near the end
-                for line in reversed(list(f)):
-                    if "Game Version: v" in line:
-                        # More specific regex: v followed by digits.digits.digits
-                        match = re.search(r"(v\d+\.\d+\.\d+)", line)
-                        if match:
-                            version_str = match.group(1)
-                            self.console.debug(
-                                f"Found version in log line: {version_str}"
-                            )
-                            return version_str
-            self.console.debug(f"Version string not found in log file: {log_file}")
-            return None
+            # The last reported version is near the end: read the log backwards
+            version_str = _log_version(log_file, log_stat.st_mtime_ns, log_stat.st_size)
+            if version_str:
+                self.console.debug(f"Found version in log line: {version_str}")
+            else:
+                self.console.debug(f"Version string not found in log file: {log_file}")
+            return version_str
         except OSError as e:
             self.console.warning(f"Could not read log file '{log_file}': {e}")
             return None
@@ -356,6 +468,68 @@ class VersionChecker:
             )
             return None
 
+    def _load_api_cache(self) -> Dict[str, Any]:
+        """Returns the on-disk API cache entries, reading the file once.
+
+        A cache file owned by another user is ignored.
+        """
+        if self._api_cache is None:
+            try:
+                with open(_api_cache_path(), "rb") as f:
+                    if (
+                        hasattr(os, "geteuid")
+                        and os.fstat(f.fileno()).st_uid != os.geteuid()
+                    ):
+                        raise OSError("API cache is owned by another user")
+                    cache = json.loads(f.read())
+                self._api_cache = cache if isinstance(cache, dict) else {}
+            except (OSError, ValueError):
+                self._api_cache = {}
+        return self._api_cache
+
+    def _is_fresh(self, entry: Any, now: float) -> bool:
+        """Whether a cache entry was stored less than api_cache_ttl seconds ago."""
+        try:
+            return 0 <= now - entry["ts"] < self.api_cache_ttl
+        except (TypeError, KeyError):
+            return False
+
+    def _get_cached(self, key: str) -> Any:
+        """Returns the value cached under key if still fresh, otherwise None.
+
+        Args:
+            key: Request method and URL, e.g. "GET https://...".
+        """
+        if not self._use_api_cache:
+            return None
+        entry = self._load_api_cache().get(key)
+        if self._is_fresh(entry, time.time()):
+            return entry["value"]
+        return None
+
+    def _store_cached(self, key: str, value: Any) -> None:
+        """Caches a JSON-serializable value under key on disk (best effort).
+
+        Expired entries are dropped on each write, so the file stays small.
+        """
+        if not self._use_api_cache:
+            return
+        now = time.time()
+        cache = {
+            cached_key: entry
+            for cached_key, entry in self._load_api_cache().items()
+            if self._is_fresh(entry, now)
+        }
+        cache[key] = {"ts": now, "value": value}
+        self._api_cache = cache
+
+        cache_path = _api_cache_path()
+        try:
+            os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+            write_file_atomic(cache_path, json.dumps(cache).encode("utf-8"))
+        except OSError as e:
+            self.console.debug(f"Could not write API cache '{cache_path}': {e}")
+
     def _fetch_version_data_from_api(self) -> Dict[str, Any]:
         """Fetches and parses version data from the VS API.
 
@@ -366,6 +540,14 @@ class VersionChecker:
             VersioningError: If the request fails, status code is non-200,
                            or the response is not valid JSON.
         """
+        cache_key = f"GET {self.game_version_api_url}"
+        cached = self._get_cached(cache_key)
+        if isinstance(cached, dict):
+            self.console.debug(
+                f"Using cached API response for: {self.game_version_api_url}"
+            )
+            return cached
+
         self.console.debug(f"Fetching data from API URL: {self.game_version_api_url}")
         try:
             # Assume http_client.get returns a response object with status_code and json() method
@@ -389,6 +571,7 @@ class VersionChecker:
                 data = response.json()
                 if not isinstance(data, dict):  # Basic validation
                     raise ValueError("API response is not a JSON object")
+                self._store_cached(cache_key, data)
                 return data
             except json.JSONDecodeError as json_e:
                 err_msg = f"Failed to parse JSON response from API: {json_e}"
@@ -514,11 +697,13 @@ class VersionChecker:
                 capture_output=True,
                 # No input=... needed now
             )
-            # Decode stdout
-            output = result.stdout.decode("utf-8").strip() if result.stdout else ""
+            output = result.stdout or ""
+            if isinstance(output, bytes):
+                output = output.decode("utf-8")
+            output = output.strip()
 
             if output and output != "null":
-                if re.match(r"^\d+\.\d+(\.\d+)?(-\w+\.\d+)?$", output):
+                if API_VERSION_RE.match(output):
                     return output
                 else:
                     raise VersioningError(